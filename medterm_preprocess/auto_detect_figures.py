@@ -10,9 +10,18 @@
 - (-) 텍스트가 컬러 강조된 페이지에서 false positive 가능 → 임계값 튜닝 필요
 """
 import cv2
+import hashlib
+import json
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+
+from profiling import stage
+
+# 검출·크롭 결과에 영향을 주는 코드 변경 시 올린다 → 캐시 전체 무효화
+DETECT_VERSION = 1
 
 
 @dataclass
@@ -25,42 +34,115 @@ class FigureBox:
     area_ratio: float  # 페이지 대비 박스 면적 비율
 
 
-def detect_figures(image_path: Path, *,
-                   min_area_ratio: float = 0.04,   # 페이지의 4% 이상
-                   max_area_ratio: float = 0.65,   # 페이지의 65% 미만 (전체 page 제외)
-                   sat_threshold: int = 25,        # 채도 임계
-                   dilate_iter: int = 8) -> list[FigureBox]:
-    """단일 페이지 이미지에서 그림 박스 후보 반환."""
+def iou(a: FigureBox, b: FigureBox) -> float:
+    """두 박스의 IoU (Intersection over Union)."""
+    ix = max(0, min(a.x + a.w, b.x + b.w) - max(a.x, b.x))
+    iy = max(0, min(a.y + a.h, b.y + b.h) - max(a.y, b.y))
+    inter = ix * iy
+    union = a.w * a.h + b.w * b.h - inter
+    return inter / union if union else 0.0
+
+
+def match_boxes(ref: list[FigureBox], cand: list[FigureBox],
+                min_iou: float = 0.0) -> tuple[list[float], int, int]:
+    """ref·cand 박스를 IoU 큰 순으로 greedy 1:1 매칭 → (매칭 IoU 목록, 누락 수, 초과 수).
+
+    min_iou 는 하한 (IoU ≥ min_iou 면 매칭) — 겹치지 않는 쌍 (IoU 0) 은 매칭하지 않는다.
+    """
+    pairs = sorted(((iou(r, c), i, j) for i, r in enumerate(ref) for j, c in enumerate(cand)),
+                   reverse=True)
+    used_r, used_c, ious = set(), set(), []
+    for v, i, j in pairs:
+        if v <= 0 or v < min_iou or i in used_r or j in used_c:
+            continue
+        used_r.add(i)
+        used_c.add(j)
+        ious.append(v)
+    return ious, len(ref) - len(used_r), len(cand) - len(used_c)
+
+
+def _page_no(image_path: Path) -> int:
+    return int(image_path.stem.split('_')[-1]) if '_' in image_path.stem else 0
+
+
+def detect_figures(image_path: Path, **params) -> list[FigureBox]:
+    """단일 페이지 이미지 파일에서 그림 박스 후보 반환."""
     img = cv2.imread(str(image_path))
     if img is None:
         return []
-    h, w = img.shape[:2]
-    page_area = h * w
+    return detect_figures_in_image(img, _page_no(image_path), **params)
 
-    # HSV 변환 — saturation으로 컬러 그림 검출
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-    sat = hsv[:, :, 1]
+
+def detect_figures_in_image(img: np.ndarray, page_no: int = 0, *,
+                            min_area_ratio: float = 0.04,   # 페이지의 4% 이상
+                            max_area_ratio: float = 0.65,   # 페이지의 65% 미만 (전체 page 제외)
+                            sat_threshold: int = 25,        # 채도 임계
+                            dilate_iter: int = 8,
+                            proxy_long_side: int | None = None) -> list[FigureBox]:
+    """이미 디코딩된 BGR 페이지(ndarray)에서 그림 박스 후보 반환.
+
+    proxy_long_side 를 주면 긴 변이 그 크기가 되도록 축소한 proxy 에서
+    threshold·dilation·contour 를 수행하고, 박스는 원본 좌표로 환산해 반환한다.
+    dilation 커널과 최소 변 길이(100px)는 축소 비율에 맞춰 함께 줄어든다.
+    """
+    with stage('detect.hsv'):
+        sat, scale = saturation_channel(img, proxy_long_side)
 
     # 임계 처리 후 dilation으로 인접 영역 병합
-    _, mask = cv2.threshold(sat, sat_threshold, 255, cv2.THRESH_BINARY)
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (15, 15))
-    mask = cv2.dilate(mask, kernel, iterations=dilate_iter)
+    with stage('detect.threshold'):
+        _, mask = cv2.threshold(sat, sat_threshold, 255, cv2.THRESH_BINARY)
+    with stage('detect.dilate'):
+        mask = cv2.dilate(mask, dilate_kernel(scale), iterations=dilate_iter)
+
+    with stage('detect.contours'):
+        return boxes_from_mask(mask, img.shape[:2], scale, page_no,
+                               min_area_ratio=min_area_ratio, max_area_ratio=max_area_ratio)
+
+
+def saturation_channel(img: np.ndarray,
+                       proxy_long_side: int | None = None) -> tuple[np.ndarray, float]:
+    """HSV 채도 채널과 축소 비율(scale) 반환 — 채도로 컬러 그림 검출."""
+    h, w = img.shape[:2]
+    scale = 1.0
+    if proxy_long_side and max(h, w) > proxy_long_side:
+        scale = proxy_long_side / max(h, w)
+        img = cv2.resize(img, (round(w * scale), round(h * scale)),
+                         interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    return hsv[:, :, 1], scale
+
+
+def dilate_kernel(scale: float = 1.0) -> np.ndarray:
+    k = max(3, round(15 * scale) | 1)  # 홀수 커널 유지
+    return cv2.getStructuringElement(cv2.MORPH_RECT, (k, k))
+
+
+def boxes_from_mask(mask: np.ndarray, page_shape: tuple[int, int], scale: float,
+                    page_no: int = 0, *,
+                    min_area_ratio: float = 0.04,
+                    max_area_ratio: float = 0.65) -> list[FigureBox]:
+    """dilation 된 mask 의 외곽 contour → 필터된 원본 좌표 박스 (면적 큰 순 ≤ 3)."""
+    h, w = page_shape
+    page_area = h * w
+    min_side = 100 * scale
 
     contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
     boxes: list[FigureBox] = []
-    page_no = int(image_path.stem.split('_')[-1]) if '_' in image_path.stem else 0
     for c in contours:
         x, y, bw, bh = cv2.boundingRect(c)
-        area = bw * bh
-        ratio = area / page_area
-        if not (min_area_ratio <= ratio <= max_area_ratio):
-            continue
         # 너무 가늘고 긴 영역(헤더 라인 등) 제외
-        if bw < 100 or bh < 100:
+        if bw < min_side or bh < min_side:
             continue
         if max(bw, bh) / max(min(bw, bh), 1) > 8:
             continue
+        if scale != 1.0:
+            x, y = int(x / scale), int(y / scale)
+            bw = min(w - x, round(bw / scale))
+            bh = min(h - y, round(bh / scale))
+        ratio = bw * bh / page_area
+        if not (min_area_ratio <= ratio <= max_area_ratio):
+            continue
         boxes.append(FigureBox(page_no, x, y, bw, bh, ratio))
 
     # 면적 큰 순으로 정렬, 상위 3개만 (페이지당 그림 ≤ 3 가정)
@@ -70,45 +152,235 @@ def detect_figures(image_path: Path, *,
 
 def crop_and_save(image_path: Path, box: FigureBox, out_path: Path,
                   pad: int = 12) -> None:
-    img = cv2.imread(str(image_path))
+    crop_image(cv2.imread(str(image_path)), box, out_path, pad)
+
+
+def crop_image(img: np.ndarray, box: FigureBox, out_path: Path,
+               pad: int = 12) -> None:
+    """디코딩된 페이지에서 box(+pad) 영역을 잘라 JPEG 로 저장 — 페이지 재디코딩 없음."""
     h, w = img.shape[:2]
     x1 = max(0, box.x - pad)
     y1 = max(0, box.y - pad)
     x2 = min(w, box.x + box.w + pad)
     y2 = min(h, box.y + box.h + pad)
     crop = img[y1:y2, x1:x2]
-    cv2.imwrite(str(out_path), crop, [cv2.IMWRITE_JPEG_QUALITY, 92])
+    with stage('detect.crop_write'):
+        cv2.imwrite(str(out_path), crop, [cv2.IMWRITE_JPEG_QUALITY, 92])
+
+
+def _process_page(n: int, src: Path, out_dir: Path,
+                  detect_params: dict | None = None) -> tuple[list[FigureBox], list[Path]]:
+    """한 페이지 검출 + 크롭 — 페이지는 정확히 한 번만 디코딩한다.
+
+    워커 프로세스에서도 그대로 실행된다.
+    """
+    with stage('detect.decode'):
+        img = cv2.imread(str(src))
+    if img is None:
+        return [], []
+    return _process_image(n, img, out_dir, detect_params)
+
+
+def _process_image(n: int, img: np.ndarray, out_dir: Path,
+                   detect_params: dict | None = None) -> tuple[list[FigureBox], list[Path]]:
+    boxes = detect_figures_in_image(img, n, **(detect_params or {}))
+    dests: list[Path] = []
+    for i, box in enumerate(boxes, 1):
+        dest = out_dir / f'page_{n:03d}_auto_{i}.jpg'
+        crop_image(img, box, dest)
+        dests.append(dest)
+    return boxes, dests
+
+
+def _stat(src: Path) -> tuple[int, int]:
+    st = src.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _sha256(src: Path) -> str:
+    return hashlib.sha256(src.read_bytes()).hexdigest()
+
+
+class DetectCache:
+    """페이지 검출 결과 on-disk 캐시 (JSON).
+
+    키 = (페이지 파일 sha256, 검출 파라미터, DETECT_VERSION). 파일 크기·mtime 이
+    그대로면 해시 계산도 생략한다. 크롭 파일이 지워졌으면 miss 로 본다.
+    """
+
+    def __init__(self, path: Path, detect_params: dict):
+        self.path = path
+        params = {**detect_figures_in_image.__kwdefaults__, **detect_params}
+        self.params_key = json.dumps(params, sort_keys=True)
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding='utf-8'))
+            except ValueError:
+                print(f'  [cache] {path.name} 손상 — 무시하고 새로 만듦')
+
+    def get(self, n: int, src: Path) -> tuple[list[FigureBox], list[Path]] | None:
+        e = self.entries.get(str(n))
+        if not e or e['version'] != DETECT_VERSION or e['params'] != self.params_key:
+            return None
+        size, mtime = _stat(src)
+        if (e['size'], e['mtime_ns']) != (size, mtime):
+            if e['sha256'] != _sha256(src):
+                return None
+            e['size'], e['mtime_ns'] = size, mtime  # touch 만 된 경우 — 다음엔 해시 생략
+        crops = [Path(c) for c in e['crops']]
+        if not all(c.exists() for c in crops):
+            return None
+        return [FigureBox(**b) for b in e['boxes']], crops
+
+    def put(self, n: int, src: Path, boxes: list[FigureBox], crops: list[Path]) -> None:
+        size, mtime = _stat(src)
+        self.entries[str(n)] = {
+            'version': DETECT_VERSION,
+            'params': self.params_key,
+            'sha256': _sha256(src),
+            'size': size,
+            'mtime_ns': mtime,
+            'boxes': [asdict(b) for b in boxes],
+            'crops': [str(c) for c in crops],
+        }
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.entries, ensure_ascii=False), encoding='utf-8')
+        tmp.replace(self.path)
 
 
 def process_pages(raw_dir: Path, out_dir: Path,
-                  page_range: tuple[int, int]) -> dict[int, list[FigureBox]]:
-    """raw_dir/page_NNN.jpg 들에서 그림 검출·크롭 → out_dir."""
+                  page_range: tuple[int, int], *,
+                  workers: int = 1, cache_path: Path | None = None,
+                  **detect_params) -> dict[int, list[FigureBox]]:
+    """raw_dir/page_NNN.jpg 들에서 그림 검출·크롭 → out_dir.
+
+    detect_params 는 detect_figures_in_image 의 키워드 인자로 그대로 전달된다
+    (예: proxy_long_side=1000).
+
+    workers > 1 이면 페이지 단위로 프로세스 풀에 분배한다. 결과 dict 와
+    출력 파일명은 직렬 실행과 동일하며, 로그도 페이지 순서대로 출력된다.
+
+    cache_path 를 주면 DetectCache 로 변경 없는 페이지를 건너뛴다.
+    """
     out_dir.mkdir(exist_ok=True)
+    pages = [(n, raw_dir / f'page_{n:03d}.jpg')
+             for n in range(page_range[0], page_range[1] + 1)]
+    pages = [(n, src) for n, src in pages if src.exists()]
+    cache = DetectCache(cache_path, detect_params) if cache_path else None
+
     results: dict[int, list[FigureBox]] = {}
-    for n in range(page_range[0], page_range[1] + 1):
-        src = raw_dir / f'page_{n:03d}.jpg'
-        if not src.exists():
-            continue
+    ex = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        outcomes, misses = [], []
+        for n, src in pages:
+            hit = cache.get(n, src) if cache else None
+            if hit is not None:
+                outcomes.append((n, lambda hit=hit: hit))
+                continue
+            misses.append((n, src))
+            if ex:
+                outcomes.append((n, ex.submit(_process_page, n, src, out_dir, detect_params).result))
+            else:
+                outcomes.append((n, partial(_process_page, n, src, out_dir, detect_params)))
+        crops = _collect(outcomes, results)
+    finally:
+        if ex:
+            ex.shutdown()
+
+    if cache:
+        for n, src in misses:
+            if n in results:
+                cache.put(n, src, results[n], crops[n])
+        cache.save()
+        print(f'  [cache] {len(pages) - len(misses)}/{len(pages)} pages 재사용')
+    return results
+
+
+def _collect(outcomes, results: dict[int, list[FigureBox]]) -> dict[int, list[Path]]:
+    """(page, 결과 getter) 를 순서대로 받아 results 에 병합 — 실패 페이지는 skip 보고.
+
+    성공한 페이지의 크롭 경로를 반환한다.
+    """
+    crops: dict[int, list[Path]] = {}
+    for n, get in outcomes:
         try:
-            boxes = detect_figures(src)
+            boxes, dests = get()
         except Exception as e:
             print(f'  [skip] page {n}: {e}')
             continue
         results[n] = boxes
-        for i, box in enumerate(boxes, 1):
-            dest = out_dir / f'page_{n:03d}_auto_{i}.jpg'
-            crop_and_save(src, box, dest)
+        crops[n] = dests
+        for i, (box, dest) in enumerate(zip(boxes, dests), 1):
             print(f'  detected page {n} fig{i}: {box.w}x{box.h} '
                   f'({box.area_ratio*100:.1f}%) → {dest.name}')
+    return crops
+
+
+def process_pdf(pdf_path: Path, out_dir: Path,
+                page_range: tuple[int, int] | None = None, *,
+                dpi: int = 300, prefetch: int = 4,
+                **detect_params) -> dict[int, list[FigureBox]]:
+    """원본 PDF 를 페이지 단위로 스트리밍하며 검출·크롭 → out_dir.
+
+    raw/page_NNN.jpg 를 거치지 않는다 (pdf_pages.iter_pdf_pages). 출력 파일명은
+    process_pages 와 동일한 page_NNN_auto_K.jpg.
+    """
+    from pdf_pages import iter_pdf_pages
+
+    out_dir.mkdir(exist_ok=True)
+
+    def outcomes():
+        for n, img in iter_pdf_pages(pdf_path, page_range, dpi=dpi, prefetch=prefetch):
+            yield n, partial(_process_image, n, img, out_dir, detect_params)
+
+    results: dict[int, list[FigureBox]] = {}
+    _collect(outcomes(), results)
     return results
 
 
 if __name__ == '__main__':
+    import argparse
+    import os
     import sys
+    import profiling
     root = Path('/mnt/g/vine_academy/wawa_smart_erp/medterm_preprocess')
-    args = sys.argv[1:]
-    start = int(args[0]) if args else 1
-    end = int(args[1]) if len(args) > 1 else 20
-    print(f'auto-detect figures in pages {start}~{end}')
-    process_pages(root / 'raw', root / 'images_auto', (start, end))
+    ap = argparse.ArgumentParser()
+    ap.add_argument('start', nargs='?', type=int, default=None,
+                    help='시작 페이지 (기본: raw/ 1, --pdf 문서 처음)')
+    ap.add_argument('end', nargs='?', type=int, default=None,
+                    help='끝 페이지 (기본: raw/ 20, --pdf 문서 끝)')
+    ap.add_argument('--workers', type=int, default=1,
+                    help=f'페이지 병렬 처리 프로세스 수 (CPU {os.cpu_count()}개, raw/ 모드 전용)')
+    ap.add_argument('--proxy', type=int, default=None, metavar='PX',
+                    help='긴 변 PX 로 축소한 proxy 에서 검출 (예: 1000)')
+    ap.add_argument('--no-cache', action='store_true',
+                    help='검출 캐시 무시하고 모든 페이지 재처리')
+    ap.add_argument('--pdf', type=Path, default=None,
+                    help='raw/ 대신 원본 PDF 에서 페이지를 직접 스트리밍')
+    ap.add_argument('--dpi', type=int, default=300)
+    profiling.add_cli_flag(ap)
+    args = ap.parse_args()
+    profiling.init_from_args(args)
+    out_dir = root / 'images_auto'
+    if args.pdf:
+        # 스트리밍은 렌더링 스레드 1개 + 순차 검출 — 프로세스 병렬 없음
+        if args.workers != 1:
+            ap.error('--workers 는 --pdf 와 함께 쓸 수 없음 (PDF 모드는 순차 처리)')
+        page_range = None
+        if args.start is not None or args.end is not None:
+            page_range = (args.start or 1, args.end or sys.maxsize)
+        print(f'auto-detect figures in {args.pdf} pages '
+              f'{args.start or 1}~{args.end if args.end is not None else "끝"}')
+        process_pdf(args.pdf, out_dir, page_range,
+                    dpi=args.dpi, proxy_long_side=args.proxy)
+    else:
+        start = 1 if args.start is None else args.start
+        end = 20 if args.end is None else args.end
+        print(f'auto-detect figures in pages {start}~{end}')
+        process_pages(root / 'raw', out_dir, (start, end),
+                      workers=args.workers, proxy_long_side=args.proxy,
+                      cache_path=None if args.no_cache else out_dir / '.detect_cache.json')
     print('done')
@@ -0,0 +1,94 @@
+"""auto_detect_figures 벤치마크 — 페이지당 디코딩 횟수에 따른 시간·메모리 비교.
+
+모드:
+  legacy       detect_figures(path) + crop_and_save(path) — 박스마다 페이지 재디코딩
+  decode-once  _process_page — 페이지 1회 디코딩 후 ndarray 재사용
+
+각 모드는 새 프로세스(spawn)에서 실행해 peak RSS 가 서로 섞이지 않게 한다.
+자식이 실패하면 그 예외로 중단한다 (부모가 무한 대기하지 않음).
+
+사용:
+  python bench_detect.py raw/ 1 100
+  python bench_detect.py --synthetic 100      # 300dpi A4 크기 합성 페이지 생성 후 측정
+"""
+import argparse
+import multiprocessing as mp
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import auto_detect_figures as adf
+
+
+def _run_mode(mode: str, pages: list[tuple[int, Path]], out_dir: Path) -> tuple[float, float]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    for n, src in pages:
+        if mode == 'legacy':
+            for i, box in enumerate(adf.detect_figures(src), 1):
+                adf.crop_and_save(src, box, out_dir / f'page_{n:03d}_auto_{i}.jpg')
+        else:
+            adf._process_page(n, src, out_dir)
+    elapsed = time.perf_counter() - t0
+    # ru_maxrss: Linux 는 KB 단위
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_synthetic(raw_dir: Path, n_pages: int) -> None:
+    """컬러 박스 1~3개 + 텍스트 줄이 있는 2480x3508 (A4 300dpi) 페이지 생성."""
+    import cv2
+    import numpy as np
+    rng = np.random.default_rng(0)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    for n in range(1, n_pages + 1):
+        img = np.full((3508, 2480, 3), 248, np.uint8)
+        for k in range(n % 3 + 1):
+            x = int(rng.integers(150, 1400))
+            y = int(rng.integers(200, 600)) + k * 1050
+            color = tuple(int(c) for c in rng.integers(0, 255, 3))
+            cv2.rectangle(img, (x, y), (x + 800, y + 600), color, -1)
+        for row in range(3200, 3400, 60):
+            cv2.putText(img, 'medical terminology text line', (150, row),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (20, 20, 20), 2)
+        cv2.imwrite(str(raw_dir / f'page_{n:03d}.jpg'), img)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('raw_dir', nargs='?')
+    ap.add_argument('start', nargs='?', type=int, default=1)
+    ap.add_argument('end', nargs='?', type=int, default=100)
+    ap.add_argument('--synthetic', type=int, metavar='N',
+                    help='raw_dir 대신 합성 페이지 N장으로 측정')
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if args.synthetic:
+            raw_dir = tmp / 'raw'
+            make_synthetic(raw_dir, args.synthetic)
+            start, end = 1, args.synthetic
+        elif args.raw_dir:
+            raw_dir = Path(args.raw_dir)
+            start, end = args.start, args.end
+        else:
+            ap.error('raw_dir 또는 --synthetic N 필요')
+        pages = [(n, raw_dir / f'page_{n:03d}.jpg') for n in range(start, end + 1)]
+        pages = [(n, p) for n, p in pages if p.exists()]
+        if not pages:
+            ap.error(f'{raw_dir} 에 page_NNN.jpg 없음')
+
+        ctx = mp.get_context('spawn')
+        print(f'{len(pages)} pages')
+        print(f'{"mode":<12} {"total s":>9} {"ms/page":>9} {"peak MB":>9}')
+        for mode in ('legacy', 'decode-once'):
+            # 모드마다 새 워커 1개 — 자식 예외·비정상 종료가 .result() 로 올라온다
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                elapsed, peak_mb = pool.submit(_run_mode, mode, pages, tmp / mode).result()
+            print(f'{mode:<12} {elapsed:>9.2f} {elapsed / len(pages) * 1000:>9.1f} {peak_mb:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""build_pdf 벤치마크 — 합성 시험 크기·유형 구성별 빌드 시간·메모리·쪽수·용량.
+
+합성 시험: VALID_TYPES 6유형을 --mix 가중치로 섞은 N문항 (seed 고정 → 재현 가능).
+크기 × variant(문제지/정답해설) 조합마다 새 프로세스(spawn)에서 build_pdf 를
+실행해 peak RSS 가 서로 섞이지 않게 한다. 부모의 FONT_PATHS 는 자식에 그대로 넘긴다.
+자식이 실패하면 (폰트 없음 등) 그 예외로 중단한다.
+
+결과는 --json 으로 저장하고, 다음 측정 때 --compare 로 기준선 대비 배율을 본다.
+
+사용:
+  python bench_pdf.py                                   # 30 / 300 / 3000문항
+  python bench_pdf.py --sizes 30 300 --mix 객관식=3,매칭=2,OX=1 --json output/bench_pdf.json
+  python bench_pdf.py --compare output/bench_pdf.json
+"""
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import random
+import re
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_pdf
+from validate_exam import VALID_TYPES
+
+TYPES = sorted(VALID_TYPES)
+SYLLABLES = '가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허'
+_PAGE_RE = re.compile(rb'/Type\s*/Page[^s]')
+
+
+def parse_mix(spec: str | None) -> dict[str, float]:
+    """'객관식=3,OX=1' → {유형: 가중치}. 생략 시 6유형 균등."""
+    if not spec:
+        return {t: 1.0 for t in TYPES}
+    mix = {}
+    for part in spec.split(','):
+        name, _, w = part.partition('=')
+        if name not in VALID_TYPES:
+            raise ValueError(f'알 수 없는 유형: {name} (가능: {", ".join(TYPES)})')
+        mix[name] = float(w or 1)
+    return mix
+
+
+def _text(rng: random.Random, lo: int, hi: int) -> str:
+    words = [''.join(rng.choices(SYLLABLES, k=rng.randint(1, 4)))
+             for _ in range(rng.randint(lo, hi))]
+    return ' '.join(words)
+
+
+def make_question(rng: random.Random, no: int, qtype: str) -> dict:
+    """validate_exam 을 통과하는 합성 문항 1개."""
+    q = {'no': no, 'type': qtype, 'topic': _text(rng, 1, 3),
+         'difficulty': rng.choice('하중상'), 'question': _text(rng, 8, 40),
+         'explanation': _text(rng, 10, 50)}
+    if qtype == '객관식':
+        q['choices'] = [_text(rng, 1, 6) for _ in range(rng.randint(4, 5))]
+        q['answer'] = 'ABCDE'[rng.randrange(len(q['choices']))]
+    elif qtype == '매칭':
+        n = rng.randint(3, 6)
+        keys = [str(i + 1) for i in range(n)]
+        opts = [chr(ord('A') + i) for i in range(n)]
+        q['items'] = {k: _text(rng, 1, 4) for k in keys}
+        q['options'] = {o: _text(rng, 1, 4) for o in opts}
+        q['answer'] = dict(zip(keys, rng.sample(opts, n)))
+    elif qtype == '용어분해':
+        roles = ['r', 'cv', 's'] if rng.random() < 0.6 else ['p', 'r', 'cv', 'r', 's']
+        q['parts'] = [{'role': r, 'value': _text(rng, 1, 1), 'meaning': _text(rng, 1, 2)}
+                      for r in roles]
+        q['answer'] = ' / '.join(p['value'] for p in q['parts'])
+    elif qtype == 'OX':
+        q['answer'] = rng.choice('OX')
+    elif qtype == '빈칸':
+        q['answer'] = [_text(rng, 1, 2), _text(rng, 1, 2)]
+    else:
+        q['answer'] = _text(rng, 1, 3)
+    return q
+
+
+def make_exam(n: int, mix: dict[str, float], seed: int = 0) -> dict:
+    rng = random.Random(f'{seed}:{n}')
+    types = rng.choices(list(mix), weights=list(mix.values()), k=n)
+    qs = [make_question(rng, i, t) for i, t in enumerate(types, 1)]
+    return {'source': {'title': f'벤치마크 {n}문항', 'total': n,
+                       'types': sorted(set(types))},
+            'questions': qs}
+
+
+def count_pages(pdf_path: Path) -> int:
+    return len(_PAGE_RE.findall(pdf_path.read_bytes()))
+
+
+def _run(json_path: str, variant: str, out_path: str, font_paths: dict) -> tuple[float, float]:
+    build_pdf.FONT_PATHS.update(font_paths)
+    t0 = time.perf_counter()
+    build_pdf.build_pdf(json_path, out_path, title='벤치마크', subtitle=variant,
+                        with_answer=(variant == 'answer'))
+    elapsed = time.perf_counter() - t0
+    # ru_maxrss: Linux 는 KB 단위
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench(sizes: list[int], mix: dict[str, float], *, seed: int = 0) -> list[dict]:
+    ctx = mp.get_context('spawn')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in sizes:
+            json_path = tmp / f'exam_{n}.json'
+            json_path.write_text(json.dumps(make_exam(n, mix, seed), ensure_ascii=False),
+                                 encoding='utf-8')
+            for variant in ('problem', 'answer'):
+                out = tmp / f'exam_{n}_{variant}.pdf'
+                # 실행마다 새 워커 1개 — 자식 예외는 .result() 로 올라오고,
+                # 자식이 죽으면 BrokenProcessPool 로 끝난다 (부모가 무한 대기하지 않음)
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    elapsed, peak_mb = pool.submit(_run, str(json_path), variant, str(out),
+                                                   dict(build_pdf.FONT_PATHS)).result()
+                rows.append({'questions': n, 'variant': variant,
+                             'seconds': round(elapsed, 3), 'peak_rss_mb': round(peak_mb, 1),
+                             'pages': count_pages(out), 'bytes': out.stat().st_size,
+                             'ms_per_question': round(elapsed / n * 1000, 3)})
+    return rows
+
+
+def print_table(rows: list[dict], baseline: dict | None = None) -> None:
+    base = {(r['questions'], r['variant']): r for r in (baseline or {}).get('results', [])}
+    head = f'{"문항":>6} {"variant":<8} {"s":>8} {"ms/문항":>8} {"peak MB":>8} {"pages":>6} {"KB":>8}'
+    print(head + ('   vs 기준선 (시간 / 메모리)' if base else ''))
+    for r in rows:
+        line = (f'{r["questions"]:>6} {r["variant"]:<8} {r["seconds"]:>8.2f} '
+                f'{r["ms_per_question"]:>8.2f} {r["peak_rss_mb"]:>8.1f} {r["pages"]:>6} '
+                f'{r["bytes"] / 1024:>8.1f}')
+        b = base.get((r['questions'], r['variant']))
+        if b:
+            line += f'   x{r["seconds"] / b["seconds"]:.2f} / x{r["peak_rss_mb"] / b["peak_rss_mb"]:.2f}'
+        print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', type=int, nargs='+', default=[30, 300, 3000])
+    ap.add_argument('--mix', default=None, help='유형 가중치 (예: 객관식=3,매칭=2,OX=1)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--json', type=Path, default=None, help='결과 기준선 JSON 저장 경로')
+    ap.add_argument('--compare', type=Path, default=None, help='이전 기준선 JSON 과 비교')
+    args = ap.parse_args()
+
+    mix = parse_mix(args.mix)
+    rows = bench(args.sizes, mix, seed=args.seed)
+    baseline = json.loads(args.compare.read_text(encoding='utf-8')) if args.compare else None
+    print_table(rows, baseline)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({
+            'mix': mix, 'seed': args.seed,
+            'python': platform.python_version(), 'machine': platform.machine(),
+            'results': rows,
+        }, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f'저장: {args.json}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""시험 JSON → HTML 미리보기 (build_pdf 와 같은 문항 모델, 6유형).
+
+build_pdf.render_question 의 reportlab 출력과 같은 구성을 정적 HTML 조각으로 낸다.
+  - with_answer=True     정답·구조·해설 블록 포함 (해설지)
+  - hide_meta_in_student 문제지에서 topic·난이도 숨김 (build_pdf 와 동일 규칙)
+  - figure_id            build_pdf.figure_store 의 인쇄용 축소본을 <img> 로 (없으면 자리 표시)
+
+템플릿은 모듈 로드 시 string.Template 으로 한 번만 컴파일하고, 문항 조각은
+(문항 내용, 보기 옵션) 키로 캐시한다 — 같은 문항을 다시 미리보면 문자열 조회만 한다.
+
+사용:
+  python build_html.py output/exam_30q.json --out output/preview.html [--answer] [--meta]
+"""
+import argparse
+import html
+import json
+import time
+from pathlib import Path
+from string import Template
+
+CIRCLED = [chr(0x2460 + i) for i in range(20)]          # ① ②
+CIRCLED_UPPER = [chr(0x24B6 + i) for i in range(26)]    # Ⓐ Ⓑ
+
+T = {k: Template(v) for k, v in {
+    'question': '<section class="q q-$type">'
+                '<h3><b>문제 $no.</b> <span class="meta">[$meta]</span></h3>'
+                '<p class="body">$question</p>$figure$body$tail</section>',
+    'figure': '<figure class="fig"><img src="$src" width="$w" height="$h" alt="$alt"></figure>',
+    'figure_missing': '<figure class="fig fig-missing">그림 없음: $alt</figure>',
+    'choices': '<ol class="choices">$items</ol>',
+    'choice': '<li><b>$mark</b> $text</li>',
+    'match': '<table class="match">$rows</table>',
+    'match_row': '<tr><td>$left</td><td>$right</td></tr>',
+    'blank': '<p class="blank">답: $slots</p>',
+    'answer': '<p class="answer"><b>정답:</b> $answer</p>',
+    'struct': '<p class="explain"><b>구조:</b> $parts</p>',
+    'part': '<b>$value</b><span class="role">[$role]</span>$meaning',
+    'explain': '<p class="explain"><b>해설:</b> $text</p>',
+    'page': '<!doctype html><html lang="ko"><head><meta charset="utf-8">'
+            '<title>$title</title><style>$css</style></head><body>'
+            '<header><h1>$title</h1><p class="subtitle">$subtitle</p>'
+            '<p class="exam-meta">$exam_meta</p></header>$questions</body></html>',
+}.items()}
+
+# build_pdf 의 ST 색상과 맞춤 (C_PRIMARY / C_ACCENT / C_BORDER)
+CSS = ('body{font-family:"Nanum Gothic",sans-serif;max-width:46em;margin:2em auto;line-height:1.5}'
+       'h1{color:#8B0000;text-align:center;margin-bottom:0}'
+       '.subtitle,.exam-meta{color:grey;text-align:center}'
+       '.q{border-top:1px solid #CCC;padding:.4em 0}.q h3{color:#8B0000;font-size:1em;margin:.6em 0 .2em}'
+       '.meta,.role{color:#666;font-size:.85em;font-weight:normal}'
+       '.choices{list-style:none;padding-left:1em}'
+       '.match{border-collapse:collapse}.match td{border:1px solid #CCC;padding:.2em .5em;width:20em}'
+       '.blank{font-size:.9em}.answer{color:#1565C0;font-weight:bold}.explain{color:#444;font-size:.95em}'
+       '.fig{text-align:center;margin:.4em 0}.fig img{max-width:100%;height:auto}'
+       '.fig-missing{border:1px dashed #CCC;color:grey;padding:1em;font-size:.85em}')
+
+BLANKS = {
+    '용어분해': '______ / ______ / ______ / ______ / ______ '
+              '<span class="meta">(p=접두사, r=어근, cv=결합모음, s=접미사)</span>',
+    '단답형': '____________________',
+    '빈칸': '(1) ____________ &nbsp; (2) ____________',
+    'OX': '□ O &nbsp; □ X',
+    '객관식': '(   )',
+}
+
+_CACHE: dict[tuple, str] = {}
+_CACHE_MAX = 4096
+
+
+def esc(s) -> str:
+    return html.escape(str(s)).replace('\n', '<br>')
+
+
+def answer_html(q: dict) -> str:
+    """정답 표기 — build_pdf 해설지와 같은 규칙 (매칭 ①→Ⓐ, 객관식 ②(보기))."""
+    ans = q.get('answer')
+    if q['type'] == '매칭' and isinstance(ans, dict):
+        keys_r = list(q.get('options', {}))
+        pairs = [f'{CIRCLED[i]} → {CIRCLED_UPPER[keys_r.index(ans[k])]}'
+                 for i, k in enumerate(q.get('items', {})) if ans.get(k) in keys_r]
+        return ' &nbsp; '.join(pairs)
+    if isinstance(ans, dict):
+        return esc(', '.join(f'{k}={v}' for k, v in ans.items()))
+    if q['type'] == '객관식' and isinstance(ans, str) and len(ans) == 1 and ans in 'ABCDE':
+        idx = 'ABCDE'.index(ans)
+        return esc(f"{CIRCLED[idx]} ({q['choices'][idx]})")
+    return esc(ans)
+
+
+def _figure(figure_id: str | None) -> str:
+    """figure_id → <figure> (build_pdf.figure_store 와 같은 크롭·축소본). 크롭이 없으면 자리 표시."""
+    if not figure_id:
+        return ''
+    from build_pdf import figure_store
+    fig = figure_store().get(figure_id)
+    if fig is None:
+        return T['figure_missing'].substitute(alt=esc(figure_id))
+    path, w, h = fig
+    # FigureStore 크기는 PDF pt — <img> 는 CSS px (1pt = 96/72 px) 이라 인쇄본과 같게 환산
+    return T['figure'].substitute(src=esc(Path(path).resolve().as_uri()), w=round(w * 96 / 72),
+                                  h=round(h * 96 / 72), alt=esc(figure_id))
+
+
+def _figure_key(figure_id: str | None):
+    """캐시 키용 — 크롭이 생기거나 바뀌면 조각을 다시 만든다."""
+    if not figure_id:
+        return None
+    from build_pdf import figure_store
+    return figure_store().key(figure_id)
+
+
+def _body(q: dict) -> str:
+    out = ''
+    if 'choices' in q:
+        out += T['choices'].substitute(items=''.join(
+            T['choice'].substitute(mark=CIRCLED[i], text=esc(c)) for i, c in enumerate(q['choices'])))
+    if q['type'] == '매칭':
+        left, right = list(q.get('items', {}).values()), list(q.get('options', {}).values())
+        out += T['match'].substitute(rows=''.join(
+            T['match_row'].substitute(
+                left=f'{CIRCLED[i]} {esc(left[i])}' if i < len(left) else '',
+                right=f'{CIRCLED_UPPER[i]} {esc(right[i])}' if i < len(right) else '')
+            for i in range(max(len(left), len(right)))))
+    return out
+
+
+def _tail(q: dict, with_answer: bool) -> str:
+    if not with_answer:
+        if q['type'] == '매칭':
+            slots = ' '.join(f'{CIRCLED[i]} → (   )' for i in range(len(q.get('items', {}))))
+            return T['blank'].substitute(slots=slots)
+        return T['blank'].substitute(slots=BLANKS[q['type']]) if q['type'] in BLANKS else ''
+    out = T['answer'].substitute(answer=answer_html(q))
+    if 'parts' in q and not (q['type'] == '매칭' and isinstance(q.get('answer'), dict)):
+        out += T['struct'].substitute(parts=' / '.join(
+            T['part'].substitute(value=esc(p['value']), role=esc(p['role']),
+                                 meaning=f' <span class="meta">({esc(p["meaning"])})</span>'
+                                 if p.get('meaning') else '')
+            for p in q['parts']))
+    if 'explanation' in q:
+        out += T['explain'].substitute(text=esc(q['explanation']))
+    return out
+
+
+def render_question_html(q: dict, with_answer: bool = False,
+                         hide_meta_in_student: bool = True) -> str:
+    """문항 1개 → HTML 조각 (캐시)."""
+    show_meta = with_answer or not hide_meta_in_student
+    key = (json.dumps(q, ensure_ascii=False, sort_keys=True, default=str), with_answer, show_meta,
+           _figure_key(q.get('figure_id')))
+    frag = _CACHE.get(key)
+    if frag is None:
+        meta = (' · '.join(t for t in (q['type'], q.get('topic'), f"난이도 {q.get('difficulty')}") if t)
+                if show_meta else q['type'])
+        frag = T['question'].substitute(
+            type=esc(q['type']), no=esc(q['no']), meta=esc(meta), question=esc(q['question']),
+            figure=_figure(q.get('figure_id')), body=_body(q), tail=_tail(q, with_answer))
+        if len(_CACHE) >= _CACHE_MAX:
+            _CACHE.clear()
+        _CACHE[key] = frag
+    return frag
+
+
+def render_exam_html(data: dict, *, title: str, subtitle: str = '', with_answer: bool = False,
+                     hide_meta_in_student: bool = True, range_label: str | None = None) -> str:
+    """시험 dict → 단독 HTML 문서."""
+    src = data.get('source', {})
+    exam_meta = f"총 {src.get('total', len(data['questions']))}문항"
+    if with_answer and src.get('types'):
+        exam_meta += f" | {' · '.join(src['types'])} {len(src['types'])}유형"
+    if range_label:
+        exam_meta += f' | 출제 범위: {range_label}'
+    questions = ''.join(render_question_html(q, with_answer, hide_meta_in_student)
+                        for q in data['questions'])
+    return T['page'].substitute(title=esc(title), subtitle=esc(subtitle), css=CSS,
+                                exam_meta=esc(exam_meta), questions=questions)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('exam', type=Path)
+    ap.add_argument('--out', type=Path, required=True)
+    ap.add_argument('--answer', action='store_true', help='정답·해설 표시')
+    ap.add_argument('--meta', action='store_true', help='문제지에서도 topic·난이도 표시')
+    ap.add_argument('--title', default=None)
+    ap.add_argument('--range-label', default=None)
+    args = ap.parse_args()
+
+    data = json.loads(args.exam.read_text(encoding='utf-8'))
+    title = args.title or data.get('source', {}).get('title', args.exam.stem)
+    t0 = time.perf_counter()
+    page = render_exam_html(data, title=title, with_answer=args.answer,
+                            subtitle='정답·해설' if args.answer else '문제지',
+                            hide_meta_in_student=not args.meta, range_label=args.range_label)
+    elapsed = (time.perf_counter() - t0) * 1000
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(page, encoding='utf-8')
+    print(f'{len(data["questions"])}문항 — {elapsed:.1f} ms, {len(page) / 1024:.1f} KB')
+    print(f'저장: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,18 @@
 """기초 의학용어 Ch.01 30문제 PDF 빌드 (문제지 + 해설지)."""
+import copy
+import hashlib
+import itertools
 import json
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from PIL import Image as PILImage
+from profiling import stage
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
@@ -9,7 +21,7 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, PageBreak, KeepTogether,
-    Table, TableStyle, Image
+    Table, TableStyle, Image, Flowable
 )
 
 ROOT = Path('/mnt/g/vine_academy/wawa_smart_erp/medterm_preprocess')
@@ -21,16 +33,34 @@ FONT_PATHS = {
     'NanumM': '/usr/share/fonts/truetype/nanum/NanumGothicCoding.ttf',
 }
 
-_fonts_registered = False
+# 등록한 폰트 이름 → 경로. TTF 파싱·등록은 프로세스당 한 번 — FONT_PATHS 의
+# 경로가 바뀐 이름만 다시 등록한다. 서브셋은 문서마다 만들어지므로 여러 시험지를
+# 한 PDF 에 묶어야(render_sections) 서브셋이 한 번만 임베드된다.
+_registered = {}
+
 def register_fonts():
-    global _fonts_registered
-    if _fonts_registered:
-        return
     for name, path in FONT_PATHS.items():
+        if _registered.get(name) == path:
+            continue
         if not Path(path).exists():
             raise FileNotFoundError(f'폰트 파일 없음: {path}')
         pdfmetrics.registerFont(TTFont(name, path))
-    _fonts_registered = True
+        _registered[name] = path
+
+def embedded_font_bytes(pdf_path):
+    """PDF 에 임베드된 폰트 스트림 크기 → {폰트명: bytes} (xref 기준 중복 제거)."""
+    import fitz
+    sizes = {}
+    with fitz.open(str(pdf_path)) as pdf:
+        seen = set()
+        for pno in range(pdf.page_count):
+            for xref, _ext, _type, basefont, *_ in pdf.get_page_fonts(pno):
+                if xref in seen:
+                    continue
+                seen.add(xref)
+                content = pdf.extract_font(xref)[3]
+                sizes[basefont] = sizes.get(basefont, 0) + len(content or b'')
+    return sizes
 
 C_PRIMARY = HexColor('#8B0000')   # deep red
 C_ACCENT = HexColor('#1565C0')    # blue
@@ -64,21 +94,172 @@ def esc(s):
             .replace('>', '&gt;')
             .replace('\n', '<br/>'))
 
+MATCH_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (-1,-1), 'Nanum'),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('BOX', (0,0), (-1,-1), 0.5, C_BORDER),
+    ('INNERGRID', (0,0), (-1,-1), 0.3, C_BORDER),
+    ('LEFTPADDING', (0,0), (-1,-1), 6),
+    ('RIGHTPADDING', (0,0), (-1,-1), 6),
+    ('TOPPADDING', (0,0), (-1,-1), 4),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+    ('BACKGROUND', (0,0), (-1,0), C_BG),
+])
+
+# 마크업 파싱 결과 캐시 — para_cache() 블록 안에서만 켜진다 (exam_batch 의 배치 렌더링).
+# 같은 (마크업, 스타일 객체) 는 Paragraph 를 한 번만 파싱하고 얕은 복사본을 돌려준다.
+# wrap/split 상태는 복사본에만 생기므로 문서 간 공유 안전. 단발 빌드는 문항 텍스트가
+# 전부 달라 적중이 거의 없으므로 캐시 없이 파싱만 한다 (청크 빌드의 메모리 상한 유지).
+_para_cache: dict | None = None
+
+@contextmanager
+def para_cache():
+    """블록 안의 para() 가 공유하는 파싱 캐시 — 블록을 나가면 버린다."""
+    global _para_cache
+    prev, _para_cache = _para_cache, {}
+    try:
+        yield _para_cache
+    finally:
+        _para_cache = prev
+
+def para(markup, st):
+    if _para_cache is None:
+        return Paragraph(markup, st)
+    key = (markup, st)
+    proto = _para_cache.get(key)
+    if proto is None:
+        proto = _para_cache[key] = Paragraph(markup, st)
+    return copy.copy(proto)
+
+# ── 그림 (figure_id) ──────────────────────────────────────
+# crop_figures.py (images/page_NNN_fig_1-3.jpg) · auto_detect_figures.py
+# (images_auto/page_NNN_auto_K.jpg) 의 크롭을 인쇄 크기·DPI 로 줄인 JPEG 을
+# 한 번 만들어 두고 파일명으로 참조한다. reportlab 은 같은 파일명의 이미지를
+# 문서당 XObject 1개로 임베드하고 JPEG 은 재인코딩 없이 그대로 넣는다.
+FIGURE_DIRS = [ROOT / 'images', ROOT / 'images_auto']
+FIGURE_PRINT_DIR = OUT / '.figure_print'
+FIGURE_DPI = 200
+FIGURE_MAX = (120*mm, 90*mm)  # 문항 안 그림 최대 (폭, 높이) pt
+
+class FigureStore:
+    """figure_id → 인쇄용 JPEG 경로·크기. 원본 디렉터리 색인과 축소본은 다시 쓴다.
+
+    figure_id 는 크롭 파일 stem (page_012_fig_1-3, page_012_auto_0) 이나
+    med_figures.id (fig-ch01-1-3 → *_fig_1-3.jpg) 둘 다 받는다.
+    --watch 처럼 프로세스가 오래 살아도 낡지 않게, 색인은 못 찾을 때 디렉터리
+    mtime 이 바뀌었으면 다시 만들고, 축소본은 원본 mtime 이 바뀌면 다시 만든다.
+    """
+    def __init__(self, dirs, print_dir, dpi=FIGURE_DPI, max_size=FIGURE_MAX):
+        self.dirs = [Path(d) for d in dirs]
+        self.print_dir = Path(print_dir)
+        self.dpi = dpi
+        self.max_size = max_size
+        self._index = None
+        self._index_stamp = None
+        self._prepared = {}   # figure_id → (원본 경로, 원본 mtime_ns, get 결과)
+        self._warned = set()
+
+    def _stamp(self):
+        return tuple(d.stat().st_mtime_ns if d.exists() else None for d in self.dirs)
+
+    def _lookup(self, figure_id):
+        if figure_id in self._index:
+            return self._index[figure_id]
+        m = re.fullmatch(r'fig[-_](?:ch\d+-)?(\d+-\d+)', figure_id)
+        if m:
+            return next((p for stem, p in self._index.items()
+                         if stem.endswith(f'_fig_{m.group(1)}')), None)
+        return None
+
+    def _find(self, figure_id):
+        if self._index is not None:
+            src = self._lookup(figure_id)
+            if (src is not None and src.exists()) or self._stamp() == self._index_stamp:
+                return src
+        # 첫 조회 · 못 찾았는데 디렉터리가 바뀜 (크롭 추가·삭제) → 색인 재구성
+        self._index_stamp = self._stamp()
+        self._index = {p.stem: p for d in self.dirs if d.exists() for p in sorted(d.glob('*.jpg'))}
+        return self._lookup(figure_id)
+
+    def get(self, figure_id):
+        """→ (인쇄용 JPEG 경로, 폭 pt, 높이 pt) | None (크롭 없음)."""
+        src = self._find(figure_id)
+        if src is None:
+            if figure_id not in self._warned:
+                self._warned.add(figure_id)
+                print(f'  [warn] 그림 크롭 없음: {figure_id}')
+            return None
+        mtime = src.stat().st_mtime_ns
+        hit = self._prepared.get(figure_id)
+        if hit is None or hit[0] != src or hit[1] != mtime:
+            hit = self._prepared[figure_id] = (src, mtime, self._prepare(src))
+        return hit[2]
+
+    def _prepare(self, src):
+        with PILImage.open(src) as img:
+            w, h = img.size
+            # 비율 유지한 채 max_size 상자에 맞춤
+            scale = min(self.max_size[0] / w, self.max_size[1] / h)
+            draw_w, draw_h = w * scale, h * scale
+            # 인쇄 DPI 기준 필요 픽셀 (pt → inch × dpi); 원본보다 크게 만들지 않는다
+            target_w = min(w, math.ceil(draw_w / 72 * self.dpi))
+            dest = self.print_dir / f'{src.stem}_{target_w}px.jpg'
+            if not dest.exists() or dest.stat().st_mtime_ns < src.stat().st_mtime_ns:
+                self.print_dir.mkdir(parents=True, exist_ok=True)
+                target = (target_w, max(1, round(h * target_w / w)))
+                img.draft('RGB', target)
+                small = img.convert('RGB')
+                if small.size != target:
+                    small = small.resize(target, PILImage.LANCZOS)
+                small.save(dest, 'JPEG', quality=88)
+        return str(dest), draw_w, draw_h
+
+    def key(self, figure_id):
+        """빌드 캐시용 지문 — 원본 경로·크기·mtime (크롭이 없으면 None)."""
+        src = self._find(figure_id)
+        if src is None:
+            return None
+        st = src.stat()
+        return f'{src}:{st.st_size}:{st.st_mtime_ns}:{self.dpi}:{self.max_size}'
+
+_figure_store = None
+
+def figure_store():
+    global _figure_store
+    if _figure_store is None:
+        _figure_store = FigureStore(FIGURE_DIRS, FIGURE_PRINT_DIR)
+    return _figure_store
+
+def figure_flowable(figure_id):
+    """figure_id → 가운데 정렬 Image flowable (크롭이 없으면 None)."""
+    fig = figure_store().get(figure_id)
+    if fig is None:
+        return None
+    path, w, h = fig
+    img = Image(path, width=w, height=h, lazy=2)
+    img.hAlign = 'CENTER'
+    return img
+
 def render_question(q, with_answer=False, hide_meta_in_student=True):
     flow = []
     # 학생용 문제지에서는 topic·난이도 숨김 (학습 동기 보호)
     if with_answer or not hide_meta_in_student:
-        meta = f"<font color='#666' size='8.5'>[{q['type']} · {q['topic']} · 난이도 {q['difficulty']}]</font>"
+        tags = ' · '.join(t for t in (q['type'], q.get('topic'), f"난이도 {q['difficulty']}") if t)
+        meta = f"<font color='#666' size='8.5'>[{tags}]</font>"
     else:
         meta = f"<font color='#666' size='8.5'>[{q['type']}]</font>"
     head = f"<b>문제 {q['no']}.</b> &nbsp;{meta}"
-    flow.append(Paragraph(head, ST['qhead']))
-    flow.append(Paragraph(esc(q['question']), ST['qbody']))
+    flow.append(para(head, ST['qhead']))
+    flow.append(para(esc(q['question']), ST['qbody']))
+    if q.get('figure_id'):
+        img = figure_flowable(q['figure_id'])
+        if img is not None:
+            flow.extend([Spacer(1, 4), img, Spacer(1, 6)])
 
     # 객관식
     if 'choices' in q:
         for i, c in enumerate(q['choices']):
-            flow.append(Paragraph(f"&nbsp;&nbsp;<b>{chr(0x2460+i)}</b> &nbsp;{esc(c)}", ST['choice']))
+            flow.append(para(f"&nbsp;&nbsp;<b>{chr(0x2460+i)}</b> &nbsp;{esc(c)}", ST['choice']))
 
     # 매칭: items / options
     if q['type'] == '매칭':
@@ -98,19 +279,9 @@ def render_question(q, with_answer=False, hide_meta_in_student=True):
                 r_html = f"{chr(0x24B6 + i)}&nbsp;&nbsp;{esc(options[keys_r[i]])}"
             else:
                 r_html = ''
-            rows.append([Paragraph(l_html, ST['small']), Paragraph(r_html, ST['small'])])
+            rows.append([para(l_html, ST['small']), para(r_html, ST['small'])])
         t = Table(rows, colWidths=[80*mm, 80*mm])
-        t.setStyle(TableStyle([
-            ('FONTNAME', (0,0), (-1,-1), 'Nanum'),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('BOX', (0,0), (-1,-1), 0.5, C_BORDER),
-            ('INNERGRID', (0,0), (-1,-1), 0.3, C_BORDER),
-            ('LEFTPADDING', (0,0), (-1,-1), 6),
-            ('RIGHTPADDING', (0,0), (-1,-1), 6),
-            ('TOPPADDING', (0,0), (-1,-1), 4),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-            ('BACKGROUND', (0,0), (-1,0), C_BG),
-        ]))
+        t.setStyle(MATCH_TABLE_STYLE)
         flow.append(t)
         flow.append(Spacer(1, 4))
 
@@ -118,29 +289,29 @@ def render_question(q, with_answer=False, hide_meta_in_student=True):
     if not with_answer:
         if q['type'] == '용어분해':
             # 책 18쪽 가이드: p=접두사, r=어근, cv=결합모음, s=접미사
-            flow.append(Paragraph(
+            flow.append(para(
                 "답:  ______ / ______ / ______ / ______ / ______",
                 ST['small']))
-            flow.append(Paragraph(
+            flow.append(para(
                 "<font size='8.5' color='#666'>"
                 "&nbsp;&nbsp;&nbsp;&nbsp;(p=접두사, r=어근, cv=결합모음, s=접미사 — 해당 없는 칸은 비워 두세요)"
                 "</font>",
                 ST['small']))
         elif q['type'] == '단답형':
-            flow.append(Paragraph("답: ____________________________________________________", ST['small']))
+            flow.append(para("답: ____________________________________________________", ST['small']))
         elif q['type'] == '빈칸':
             # 본문에 ①, ② 가 이미 등장하므로 답란은 (1), (2) 표기로 차별화
-            flow.append(Paragraph(
+            flow.append(para(
                 "답:&nbsp;&nbsp; (1) ______________________&nbsp;&nbsp;&nbsp; (2) ______________________",
                 ST['small']))
         elif q['type'] == 'OX':
-            flow.append(Paragraph("답:  □ O&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;□ X&nbsp;&nbsp;&nbsp;<font size='8.5' color='#666'>(해당 칸 안에 ● 표시)</font>", ST['small']))
+            flow.append(para("답:  □ O&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;□ X&nbsp;&nbsp;&nbsp;<font size='8.5' color='#666'>(해당 칸 안에 ● 표시)</font>", ST['small']))
         elif q['type'] == '매칭':
             n_items = len(q.get('items', {}))
             slots = '  '.join(f"{chr(0x2460+i)} → (   )" for i in range(n_items))
-            flow.append(Paragraph(f"답:  {slots}", ST['small']))
+            flow.append(para(f"답:  {slots}", ST['small']))
         elif q['type'] == '객관식':
-            flow.append(Paragraph("답: (   )", ST['small']))
+            flow.append(para("답: (   )", ST['small']))
 
     # 해설지: 정답 + 해설
     if with_answer:
@@ -155,13 +326,13 @@ def render_question(q, with_answer=False, hide_meta_in_student=True):
                     j = keys_r.index(rk)
                     parts_str.append(f"{chr(0x2460+i)} → {chr(0x24B6+j)}")
             # 정답 출력 — esc() 통과 후에도 깨지지 않도록 일반 텍스트로
-            flow.append(Paragraph(
+            flow.append(para(
                 f"<b>정답:</b> &nbsp;" + " &nbsp; ".join(parts_str),
                 ST['answer']
             ))
             # 해설은 일반 흐름으로
             if 'explanation' in q:
-                flow.append(Paragraph(f"<b>해설:</b> {esc(q['explanation'])}", ST['explain']))
+                flow.append(para(f"<b>해설:</b> {esc(q['explanation'])}", ST['explain']))
             flow.append(Spacer(1, 4))
             return KeepTogether(flow)
         elif isinstance(ans, dict):
@@ -171,7 +342,7 @@ def render_question(q, with_answer=False, hide_meta_in_student=True):
             ans_str = f"{chr(0x2460+idx)} ({q['choices'][idx]})"
         else:
             ans_str = str(ans)
-        flow.append(Paragraph(f"<b>정답:</b> {esc(ans_str)}", ST['answer']))
+        flow.append(para(f"<b>정답:</b> {esc(ans_str)}", ST['answer']))
 
         if 'parts' in q:
             tokens = []
@@ -185,38 +356,153 @@ def render_question(q, with_answer=False, hide_meta_in_student=True):
                     tok += f" <font color='#666' size='9'>({esc(meaning)})</font>"
                 tokens.append(tok)
             struct_str = ' &nbsp;/&nbsp; '.join(tokens)
-            flow.append(Paragraph(f"<b>구조:</b> {struct_str}", ST['explain']))
+            flow.append(para(f"<b>구조:</b> {struct_str}", ST['explain']))
 
         if 'explanation' in q:
-            flow.append(Paragraph(f"<b>해설:</b> {esc(q['explanation'])}", ST['explain']))
+            flow.append(para(f"<b>해설:</b> {esc(q['explanation'])}", ST['explain']))
 
     flow.append(Spacer(1, 4))
     return KeepTogether(flow)
 
+def draw_footer(canvas, footer_text, page_no):
+    canvas.saveState()
+    canvas.setFont('Nanum', 8.5)
+    canvas.setFillColor(HexColor('#555555'))
+    canvas.drawString(20*mm, 10*mm, footer_text)
+    canvas.drawRightString(A4[0] - 20*mm, 10*mm, f'페이지 {page_no}')
+    canvas.setStrokeColor(C_BORDER)
+    canvas.line(20*mm, 12*mm, A4[0]-20*mm, 12*mm)
+    canvas.restoreState()
+
 def make_header_footer(footer_text):
     def _draw(canvas, doc):
-        canvas.saveState()
-        canvas.setFont('Nanum', 8.5)
-        canvas.setFillColor(HexColor('#555555'))
-        canvas.drawString(20*mm, 10*mm, footer_text)
-        canvas.drawRightString(A4[0] - 20*mm, 10*mm, f'페이지 {doc.page}')
-        canvas.setStrokeColor(C_BORDER)
-        canvas.line(20*mm, 12*mm, A4[0]-20*mm, 12*mm)
-        canvas.restoreState()
+        draw_footer(canvas, footer_text, doc.page)
     return _draw
 
-def build_pdf(json_path, out_path, *, title, subtitle, with_answer,
-              footer_text=None, range_label=None):
-    register_fonts()
-    data = json.load(open(json_path, encoding='utf-8'))
-    if footer_text is None:
-        footer_text = data.get('source', {}).get('title', title)
-    doc = SimpleDocTemplate(
+class SectionStart(Flowable):
+    """구역 시작 표시 (크기 0) — 이후 페이지의 푸터 문구와 쪽 번호 기준을 바꾼다."""
+    def __init__(self, footer_text):
+        super().__init__()
+        self.footer_text = footer_text
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv._medterm_section = (self.footer_text, self.canv.getPageNumber())
+
+class SectionDocTemplate(SimpleDocTemplate):
+    """여러 시험지를 한 PDF 로 — 푸터는 페이지 끝에서 그려 구역별 쪽 번호를 1부터 매긴다."""
+    def afterPage(self):
+        footer_text, first = getattr(self.canv, '_medterm_section', ('', 1))
+        draw_footer(self.canv, footer_text, self.canv.getPageNumber() - first + 1)
+
+def _doc(doc_cls, out_path, title):
+    return doc_cls(
         str(out_path), pagesize=A4,
         leftMargin=20*mm, rightMargin=20*mm,
         topMargin=18*mm, bottomMargin=18*mm,
         title=title, author='WAWA Academy'
     )
+
+def build_pdf(json_path, out_path, *, title, subtitle, with_answer,
+              footer_text=None, range_label=None, chunk_size=None):
+    data = json.load(open(json_path, encoding='utf-8'))
+    render_exam(data, out_path, title=title, subtitle=subtitle, with_answer=with_answer,
+                footer_text=footer_text, range_label=range_label, chunk_size=chunk_size)
+
+def render_exam(data, out_path, *, title, subtitle, with_answer,
+                footer_text=None, range_label=None, chunk_size=None):
+    """시험 dict ({'source': ..., 'questions': [...]}) → PDF.
+
+    chunk_size 를 주면 render_exam_chunked 로 — 문항 N개씩 나눠 빌드한다.
+    """
+    register_fonts()
+    if footer_text is None:
+        footer_text = data.get('source', {}).get('title', title)
+    if chunk_size:
+        return render_exam_chunked(data, out_path, title=title, subtitle=subtitle,
+                                   with_answer=with_answer, footer_text=footer_text,
+                                   range_label=range_label, chunk_size=chunk_size)
+    doc = _doc(SimpleDocTemplate, out_path, title)
+    flow = exam_flow(data, title=title, subtitle=subtitle,
+                     with_answer=with_answer, range_label=range_label)
+    drawer = make_header_footer(footer_text)
+    with stage('build_pdf.doc_build'):
+        doc.build(flow, onFirstPage=drawer, onLaterPages=drawer)
+    print(f'  saved {Path(out_path).name}')
+
+class ChunkedFlow(list):
+    """doc.build 에 넘기는 flowable 목록 — 비면 다음 chunk 를 만들어 채운다.
+
+    platypus 는 build 중 flowables[0] 을 꺼내 그리고 지우므로(del/insert 만 사용),
+    len() 호출 시점에 다음 chunk 를 이어 붙이면 메모리에는 항상 chunk 하나 분량만 있다.
+    """
+    def __init__(self, head, chunks):
+        super().__init__(head)
+        self._chunks = chunks
+
+    def __len__(self):
+        n = super().__len__()
+        while n == 0 and self._chunks is not None:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._chunks = None
+                break
+            self.extend(chunk)
+            n = super().__len__()
+        return n
+
+def render_exam_chunked(data, out_path, *, title, subtitle, with_answer,
+                        footer_text, range_label=None, chunk_size=200):
+    """문항 chunk_size 개씩 flowable 을 만들어 가며 빌드 — 대형 문제 은행용.
+
+    문서는 하나(SimpleDocTemplate 1회 build)라 쪽 번호·푸터가 그대로 이어지고 폰트
+    서브셋도 한 번만 임베드된다. flowable 은 ChunkedFlow 가 앞 chunk 를 다 그린 뒤에야
+    다음 chunk 를 만들므로 peak 메모리가 문항 수와 거의 무관하다.
+    data['questions'] 는 제너레이터여도 된다 (exam_source).
+    """
+    questions = iter(data['questions'])
+    head = exam_flow({**data, 'questions': list(itertools.islice(questions, chunk_size))},
+                     title=title, subtitle=subtitle, with_answer=with_answer,
+                     range_label=range_label)
+
+    def chunks():
+        while batch := list(itertools.islice(questions, chunk_size)):
+            with stage('build_pdf.flowables'):
+                yield [render_question(q, with_answer=with_answer) for q in batch]
+
+    doc = _doc(SimpleDocTemplate, out_path, title)
+    drawer = make_header_footer(footer_text)
+    with stage('build_pdf.doc_build'):
+        doc.build(ChunkedFlow(head, chunks()), onFirstPage=drawer, onLaterPages=drawer)
+    print(f'  saved {Path(out_path).name} ({doc.page}쪽, chunk {chunk_size}문항)')
+
+def render_sections(sections, out_path, *, title):
+    """시험지 여러 개 → 구역별 PDF 1개. 폰트 서브셋이 파일당 한 번만 임베드된다.
+
+    sections: render_exam 키워드 인자 dict 목록 (data/title/subtitle/with_answer/
+    footer_text/range_label). 구역마다 새 페이지에서 시작하고 쪽 번호는 1부터.
+    """
+    register_fonts()
+    doc = _doc(SectionDocTemplate, out_path, title)
+    flow = []
+    for i, sec in enumerate(sections):
+        sec = dict(sec)
+        data = sec.pop('data')
+        footer_text = sec.pop('footer_text', None)
+        if footer_text is None:
+            footer_text = data.get('source', {}).get('title', sec['title'])
+        if i:
+            flow.append(PageBreak())
+        flow.append(SectionStart(footer_text))
+        flow.extend(exam_flow(data, **sec))
+    with stage('build_pdf.doc_build'):
+        doc.build(flow)
+    print(f'  saved {Path(out_path).name} ({len(sections)}개 구역)')
+
+def exam_flow(data, *, title, subtitle, with_answer, range_label=None):
+    """시험지 1부의 flowable 목록 (표지 메타 + 학습자 정보 + 문항)."""
     flow = [
         Paragraph(title, ST['title']),
         Paragraph(subtitle, ST['subtitle']),
@@ -245,7 +531,7 @@ def build_pdf(json_path, out_path, *, title, subtitle, with_answer,
                 Paragraph("학번/반", ST['small']),
                 Paragraph("__________________", ST['small']),
                 Paragraph("점수", ST['small']),
-                Paragraph("____ / 30", ST['small']),
+                Paragraph(f"____ / {data['source']['total']}", ST['small']),
             ]],
             colWidths=[15*mm, 35*mm, 20*mm, 35*mm, 15*mm, 30*mm]
         )
@@ -275,30 +561,188 @@ def build_pdf(json_path, out_path, *, title, subtitle, with_answer,
         flow.append(Spacer(1, 14))
         flow.append(PageBreak())
 
-    for q in data['questions']:
-        flow.append(render_question(q, with_answer=with_answer))
+    with stage('build_pdf.flowables'):
+        for q in data['questions']:
+            flow.append(render_question(q, with_answer=with_answer))
+    return flow
 
-    drawer = make_header_footer(footer_text)
-    doc.build(flow, onFirstPage=drawer, onLaterPages=drawer)
-    print(f'  saved {Path(out_path).name}')
+
+@dataclass
+class RenderJob:
+    """PDF 1개 렌더링 작업 — variant 는 'problem'(문제지) | 'answer'(정답·해설)."""
+    json_path: str
+    variant: str
+    out_path: str
+    options: dict = field(default_factory=dict)  # title/subtitle/footer_text/range_label
+
+def run_job(job):
+    """작업 1개 실행 → (out_path, 소요 초). 워커 프로세스에서도 그대로 호출된다."""
+    t0 = time.perf_counter()
+    build_pdf(job.json_path, job.out_path, with_answer=(job.variant == 'answer'), **job.options)
+    return job.out_path, time.perf_counter() - t0
+
+def render_jobs(jobs, workers=1):
+    """작업 목록을 렌더링. workers > 1 이면 프로세스 풀 — 워커마다 폰트는
+    initializer 에서 한 번만 등록하고 이후 작업에 재사용한다. 결과는 jobs 순서."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=register_fonts) as ex:
+        return list(ex.map(run_job, jobs))
+
+# ── 빌드 캐시 ─────────────────────────────────────────────
+# 키 = sha256(정규화 문항 JSON + variant + 옵션 + 스타일·폰트 설정).
+# 문제지 키에는 해설지에만 쓰이는 필드를 넣지 않으므로, 해설만 고치면
+# 정답해설 PDF 만 다시 만든다. 렌더링 코드(이 파일)나 참조 그림 크롭이
+# 바뀌면 해당 PDF 는 무효.
+ANSWER_ONLY_KEYS = ('answer', 'explanation', 'topic', 'difficulty', 'parts')
+_style_key = None
+
+def style_key():
+    """스타일·폰트 설정 지문 — build_pdf.py 소스 + 폰트 파일 (경로·크기·mtime)."""
+    global _style_key
+    if _style_key is None:
+        h = hashlib.sha256(Path(__file__).read_bytes())
+        for name, path in sorted(FONT_PATHS.items()):
+            st = os.stat(path)
+            h.update(f'{name}={path}:{st.st_size}:{st.st_mtime_ns}'.encode())
+        _style_key = h.hexdigest()
+    return _style_key
+
+def job_key(job):
+    data = json.load(open(job.json_path, encoding='utf-8'))
+    if job.variant == 'problem':
+        data['questions'] = [{k: v for k, v in q.items() if k not in ANSWER_ONLY_KEYS}
+                             for q in data['questions']]
+    figures = sorted({q['figure_id'] for q in data['questions'] if q.get('figure_id')})
+    fig_keys = [figure_store().key(f) for f in figures]
+    payload = json.dumps([data, job.variant, job.options, style_key(), fig_keys],
+                         ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class BuildCache:
+    """출력 PDF 별 빌드 키 on-disk 캐시 (JSON) — 키가 같고 파일이 있으면 건너뛴다."""
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+            except ValueError:
+                print(f'  [cache] {self.path.name} 손상 — 무시하고 새로 만듦')
+
+    def stale(self, jobs):
+        """다시 만들어야 하는 작업과 그 키 → [(job, key)]."""
+        out = []
+        for job in jobs:
+            key = job_key(job)
+            if self.entries.get(job.out_path) != key or not Path(job.out_path).exists():
+                out.append((job, key))
+        return out
+
+    def save(self):
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.entries, ensure_ascii=False, indent=1), encoding='utf-8')
+        tmp.replace(self.path)
+
+def build_cached(jobs, cache, workers=1, force=False):
+    """캐시에 없는(또는 force) 작업만 렌더링 → 실행 결과 목록."""
+    todo = [(j, None) for j in jobs] if force else cache.stale(jobs)
+    if len(todo) < len(jobs):
+        print(f'  [cache] {len(jobs) - len(todo)}/{len(jobs)}개 PDF 최신 — 건너뜀')
+    results = render_jobs([j for j, _ in todo], workers=workers)
+    for job, key in todo:
+        cache.entries[job.out_path] = key or job_key(job)
+    cache.save()
+    return results
+
+def watch(jobs, cache, workers=1, interval=1.0):
+    """exam JSON 저장을 감시 — 바뀐 파일의 작업만 캐시 경유로 다시 빌드 (Ctrl+C 종료)."""
+    by_src = {}
+    for job in jobs:
+        by_src.setdefault(job.json_path, []).append(job)
+    mtimes = {src: os.stat(src).st_mtime_ns for src in by_src}
+    print(f'  [watch] {len(by_src)}개 파일 감시 중 (Ctrl+C 종료)')
+    try:
+        while True:
+            time.sleep(interval)
+            for src, group in by_src.items():
+                try:
+                    mtime = os.stat(src).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                if mtime == mtimes[src]:
+                    continue
+                mtimes[src] = mtime
+                print(f'  [watch] 변경: {Path(src).name}')
+                try:
+                    build_cached(group, cache, workers=workers)
+                except (ValueError, KeyError) as e:  # 저장 도중의 깨진 JSON 등
+                    print(f'  [watch] 빌드 실패: {e!r}')
+    except KeyboardInterrupt:
+        pass
+
+def chapter_jobs(json_paths, out_dir):
+    """챕터별 exam JSON → 문제지·정답해설 작업 2개씩. 제목은 JSON 의 source.title."""
+    jobs = []
+    for path in json_paths:
+        data = json.load(open(path, encoding='utf-8'))
+        title = data.get('source', {}).get('title', Path(path).stem)
+        total = len(data['questions'])
+        for variant, label in (('problem', '문제지'), ('answer', '정답해설')):
+            jobs.append(RenderJob(
+                str(path), variant, str(Path(out_dir) / f'{Path(path).stem}_{label}.pdf'),
+                {'title': title,
+                 'subtitle': f'— 단원평가 {total}문항 ({label}) —'},
+            ))
+    return jobs
 
 
 if __name__ == '__main__':
-    json_path = OUT / 'exam_30q.json'
-    build_pdf(
-        json_path, OUT / '의학용어_Ch01_문제지.pdf',
-        title='기초 의학용어 Chapter 01',
-        subtitle='— 단어의 요소와 단어 구성의 이해 · 단원평가 30문항 (문제지) —',
-        with_answer=False,
-        footer_text='기초 의학용어 Ch.01 — 단어의 요소와 단어 구성의 이해',
-        range_label='책 p.1~15 (스캔 1~20페이지)',
-    )
-    build_pdf(
-        json_path, OUT / '의학용어_Ch01_정답해설.pdf',
-        title='기초 의학용어 Chapter 01',
-        subtitle='— 단어의 요소와 단어 구성의 이해 · 단원평가 30문항 (정답·해설) —',
-        with_answer=True,
-        footer_text='기초 의학용어 Ch.01 — 정답·해설',
-        range_label='책 p.1~15 (스캔 1~20페이지)',
-    )
-    print('done')
+    import argparse
+    import profiling
+    ap = argparse.ArgumentParser()
+    ap.add_argument('exams', nargs='*', help='챕터 exam JSON 들 (생략 시 Ch.01)')
+    ap.add_argument('--workers', type=int, default=1,
+                    help=f'렌더링 프로세스 수 (CPU {os.cpu_count()}개)')
+    ap.add_argument('--chunk', type=int, default=None, metavar='N',
+                    help='문항 N개씩 flowable 생성 (대형 문제 은행 peak 메모리 제한)')
+    ap.add_argument('--force', action='store_true', help='빌드 캐시 무시하고 전부 다시 생성')
+    ap.add_argument('--watch', action='store_true', help='exam JSON 변경 시 해당 챕터만 재빌드')
+    ap.add_argument('--font-report', action='store_true',
+                    help='출력 PDF 별 임베드 폰트 바이트 출력 (PyMuPDF 필요)')
+    profiling.add_cli_flag(ap)
+    args = ap.parse_args()
+    profiling.init_from_args(args)
+
+    if args.exams:
+        jobs = chapter_jobs(args.exams, OUT)
+    else:
+        json_path = str(OUT / 'exam_30q.json')
+        jobs = [
+            RenderJob(json_path, 'problem', str(OUT / '의학용어_Ch01_문제지.pdf'), dict(
+                title='기초 의학용어 Chapter 01',
+                subtitle='— 단어의 요소와 단어 구성의 이해 · 단원평가 30문항 (문제지) —',
+                footer_text='기초 의학용어 Ch.01 — 단어의 요소와 단어 구성의 이해',
+                range_label='책 p.1~15 (스캔 1~20페이지)',
+            )),
+            RenderJob(json_path, 'answer', str(OUT / '의학용어_Ch01_정답해설.pdf'), dict(
+                title='기초 의학용어 Chapter 01',
+                subtitle='— 단어의 요소와 단어 구성의 이해 · 단원평가 30문항 (정답·해설) —',
+                footer_text='기초 의학용어 Ch.01 — 정답·해설',
+                range_label='책 p.1~15 (스캔 1~20페이지)',
+            )),
+        ]
+    if args.chunk:
+        for job in jobs:
+            job.options['chunk_size'] = args.chunk
+    cache = BuildCache(Path(jobs[0].out_path).parent / '.build_cache.json')
+    t0 = time.perf_counter()
+    built = build_cached(jobs, cache, workers=args.workers, force=args.force)
+    print(f'done — {len(built)}/{len(jobs)}개 PDF, {time.perf_counter() - t0:.2f}s')
+    if args.font_report:
+        for job in jobs:
+            fonts = embedded_font_bytes(job.out_path)
+            print(f'  {Path(job.out_path).name}: 폰트 {sum(fonts.values()) / 1024:.1f} KB '
+                  f'/ 파일 {Path(job.out_path).stat().st_size / 1024:.1f} KB')
+    if args.watch:
+        watch(jobs, cache, workers=args.workers)
@@ -1,10 +1,28 @@
-"""1-20 페이지에서 그림 영역을 비율 좌표로 크롭."""
+"""그림 영역을 비율 좌표로 크롭 — manifest(JSON/CSV) 기반 배치.
+
+manifest 가 없으면 아래 FIGS (Ch.01, 1-20 페이지) 를 사용한다.
+
+manifest 형식:
+  JSON  [{"page": 8, "fig_id": "fig_1-1", "caption": "...", "box": [x1, y1, x2, y2]}, ...]
+        또는 {"figures": [...]}  — chapter 등 다른 키는 무시
+  CSV   page,fig_id,caption,x1,y1,x2,y2  (헤더 행 필수)
+
+처리 방식:
+  - 크롭을 페이지별로 묶어 페이지당 디코딩 1회
+  - --max-width 를 주면 가장 큰 크롭도 그 폭 이상이 되는 한도에서 JPEG draft
+    (DCT 1/2·1/4·1/8 축소 디코딩), JPEG 이 아니면 Image.reduce 사용
+  - JPEG 인코딩은 스레드 풀 (Pillow 가 인코딩 중 GIL 해제)
+"""
+import argparse
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from PIL import Image
 from pathlib import Path
 
 RAW = Path('/mnt/g/vine_academy/wawa_smart_erp/medterm_preprocess/raw')
 OUT = Path('/mnt/g/vine_academy/wawa_smart_erp/medterm_preprocess/images')
-OUT.mkdir(exist_ok=True)
 
 # (page_num, fig_id, caption, ratio_box=(x1,y1,x2,y2) in 0~1)
 FIGS = [
@@ -18,14 +36,125 @@ FIGS = [
      (0.25, 0.18, 0.65, 0.55)),
 ]
 
-for page_num, fig_id, _caption, (x1r, y1r, x2r, y2r) in FIGS:
-    src = RAW / f'page_{page_num:03d}.jpg'
+
+@dataclass
+class CropSpec:
+    page: int
+    fig_id: str
+    caption: str
+    box: tuple[float, float, float, float]  # (x1, y1, x2, y2) 0~1 비율
+
+
+def load_manifest(path: Path) -> list[CropSpec]:
+    """JSON 또는 CSV manifest → CropSpec 목록."""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            return [CropSpec(int(r['page']), r['fig_id'], r.get('caption', ''),
+                             (float(r['x1']), float(r['y1']), float(r['x2']), float(r['y2'])))
+                    for r in csv.DictReader(f)]
+    data = json.loads(path.read_text(encoding='utf-8'))
+    if isinstance(data, dict):
+        data = data['figures']
+    return [CropSpec(int(d['page']), d['fig_id'], d.get('caption', ''), tuple(d['box']))
+            for d in data]
+
+
+def _reduce_factor(size: tuple[int, int], specs: list[CropSpec], max_width: int | None) -> int:
+    """페이지의 모든 크롭이 min(원본 폭, max_width) 이상으로 남는 최대 축소 배율 (1/2/4/8).
+
+    가장 좁은 크롭이 배율을 정한다 — max_width 보다 좁은 크롭이 있으면 축소하지 않는다.
+    """
+    if not max_width:
+        return 1
+    w, _ = size
+    widths = [(s.box[2] - s.box[0]) * w for s in specs]
+    factor = 1
+    while factor < 8 and all(cw / (factor * 2) >= min(cw, max_width) for cw in widths):
+        factor *= 2
+    return factor
+
+
+def _decode(src: Path, specs: list[CropSpec], max_width: int | None) -> Image.Image:
     img = Image.open(src)
+    factor = _reduce_factor(img.size, specs, max_width)
+    if factor > 1:
+        if img.format == 'JPEG':
+            # draft 는 요청 크기 이상이 되는 가장 작은 DCT scale 을 고른다
+            img.draft(img.mode, (img.width // factor, img.height // factor))
+        else:
+            img = img.reduce(factor)
+    img.load()
+    return img
+
+
+def _crop(img: Image.Image, spec: CropSpec, max_width: int | None) -> Image.Image:
     w, h = img.size
-    box = (int(w*x1r), int(h*y1r), int(w*x2r), int(h*y2r))
-    crop = img.crop(box)
-    dest = OUT / f'page_{page_num:03d}_{fig_id}.jpg'
-    crop.save(dest, quality=92)
-    print(f'  saved {dest.name} {crop.size}')
+    x1r, y1r, x2r, y2r = spec.box
+    crop = img.crop((int(w*x1r), int(h*y1r), int(w*x2r), int(h*y2r)))
+    if max_width and crop.width > max_width:
+        crop = crop.resize((max_width, round(crop.height * max_width / crop.width)),
+                           Image.LANCZOS)
+    return crop
+
+
+def crop_batch(specs: list[CropSpec], raw_dir: Path, out_dir: Path, *,
+               quality: int = 92, max_width: int | None = None,
+               workers: int = 4) -> list[Path]:
+    """specs 를 페이지별로 묶어 크롭 → out_dir/page_NNN_{fig_id}.jpg. 저장 경로 목록 반환."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    by_page: dict[int, list[CropSpec]] = {}
+    for spec in specs:
+        by_page.setdefault(spec.page, []).append(spec)
+
+    saved: list[Path] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for page_num in sorted(by_page):
+            src = raw_dir / f'page_{page_num:03d}.jpg'
+            if not src.exists():
+                print(f'  [skip] page {page_num}: {src.name} 없음')
+                continue
+            page_specs = by_page[page_num]
+            img = _decode(src, page_specs, max_width)
+            for spec in page_specs:
+                crop = _crop(img, spec, max_width)
+                dest = out_dir / f'page_{page_num:03d}_{spec.fig_id}.jpg'
+                pending.append((dest, crop.size,
+                                pool.submit(crop.save, dest, quality=quality)))
+            # 인코딩이 디코딩보다 뒤처지면 크롭 이미지가 쌓이므로 여기서 흘려보냄
+            while len(pending) > workers * 4:
+                dest, size, fut = pending.pop(0)
+                fut.result()
+                saved.append(dest)
+                print(f'  saved {dest.name} {size}')
+        for dest, size, fut in pending:
+            fut.result()
+            saved.append(dest)
+            print(f'  saved {dest.name} {size}')
+    return saved
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--manifest', type=Path, default=None,
+                    help='JSON/CSV manifest (기본: FIGS)')
+    ap.add_argument('--raw', type=Path, default=RAW)
+    ap.add_argument('--out', type=Path, default=OUT)
+    ap.add_argument('--quality', type=int, default=92)
+    ap.add_argument('--max-width', type=int, default=None,
+                    help='크롭 최대 폭(px) — 지정 시 축소 디코딩 사용')
+    ap.add_argument('--workers', type=int, default=4, help='JPEG 인코딩 스레드 수')
+    args = ap.parse_args()
+
+    if args.manifest:
+        specs = load_manifest(args.manifest)
+    else:
+        specs = [CropSpec(*f) for f in FIGS]
+    saved = crop_batch(specs, args.raw, args.out, quality=args.quality,
+                       max_width=args.max_width, workers=args.workers)
+    print(f'done — {len(saved)}/{len(specs)}')
+
 
-print('done')
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""그림 크롭 중복 제거 — dHash/pHash (NumPy) 근접 중복 클러스터링.
+
+교재는 같은 해부도·챕터 표지 그림을 여러 챕터에서 반복한다. 크롭마다
+64bit dHash·pHash 를 계산하고, 두 해시의 해밍 거리가 모두 임계 이하인
+쌍을 union-find 로 묶는다. 클러스터마다 해상도가 가장 큰 파일을 대표로
+out_dir 에 한 번만 복사하고, 매핑 테이블을 남긴다.
+
+출력:
+  - {out}/{대표 파일명}                   클러스터당 1개
+  - output/figure_dedup.json             {"map": {원본 파일명: 대표 파일명}, "clusters": [...]}
+
+매핑 키가 파일명이므로 입력 디렉터리 사이에 같은 파일명이 있으면 거부한다.
+
+seed_chapter01.py 는 이 매핑으로 중복 그림의 med_figures.r2_key 를 대표 객체로 맞춘다.
+
+사용:
+  python dedup_figures.py images/ images_auto/ --out images_dedup/
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent
+MAPPING = ROOT / 'output' / 'figure_dedup.json'
+
+_BITS = 1 << np.arange(63, -1, -1, dtype=np.uint64)
+
+
+def _pack(bits: np.ndarray) -> np.uint64:
+    return np.uint64(np.sum(bits.ravel().astype(np.uint64) * _BITS))
+
+
+def dhash(gray: np.ndarray) -> np.uint64:
+    """difference hash — 9x8 축소 후 가로 인접 픽셀 밝기 비교."""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return _pack(small[:, 1:] > small[:, :-1])
+
+
+_N = 32
+_DCT = np.cos(np.pi * np.outer(np.arange(_N), 2 * np.arange(_N) + 1) / (2 * _N))
+
+
+def phash(gray: np.ndarray) -> np.uint64:
+    """perceptual hash — 32x32 DCT 의 저주파 8x8 을 중앙값과 비교 (DC 제외 중앙값)."""
+    small = cv2.resize(gray, (_N, _N), interpolation=cv2.INTER_AREA).astype(np.float64)
+    low = (_DCT @ small @ _DCT.T)[:8, :8]
+    return _pack(low > np.median(low.ravel()[1:]))
+
+
+def hamming(a: np.uint64, many: np.ndarray) -> np.ndarray:
+    """a 와 many(uint64 배열) 각각의 해밍 거리."""
+    x = np.bitwise_xor(many, a)
+    return np.unpackbits(x.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+def hash_files(srcs: list[Path]) -> tuple[np.ndarray, np.ndarray, list[tuple[int, int]]]:
+    """(dhash 배열, phash 배열, (w, h) 목록). 디코딩은 파일당 1회 (그레이스케일)."""
+    d = np.zeros(len(srcs), np.uint64)
+    p = np.zeros(len(srcs), np.uint64)
+    sizes = []
+    for i, src in enumerate(srcs):
+        gray = cv2.imread(str(src), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError(f'이미지 디코딩 실패: {src}')
+        d[i], p[i] = dhash(gray), phash(gray)
+        sizes.append((gray.shape[1], gray.shape[0]))
+    return d, p, sizes
+
+
+def cluster(d: np.ndarray, p: np.ndarray, *, max_dhash: int = 10,
+            max_phash: int = 8) -> list[list[int]]:
+    """두 해시 거리가 모두 임계 이하인 쌍을 union-find 로 병합 → 인덱스 클러스터 목록."""
+    parent = list(range(len(d)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(d) - 1):
+        near = (hamming(d[i], d[i + 1:]) <= max_dhash) & (hamming(p[i], p[i + 1:]) <= max_phash)
+        for j in np.nonzero(near)[0] + i + 1:
+            ri, rj = find(i), find(int(j))
+            if ri != rj:
+                parent[rj] = ri
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(d)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def check_unique_names(srcs: list[Path]) -> None:
+    """파일명 중복 검사 — 매핑·out_dir·시드(figures[].file)가 모두 파일명 기준이라
+    다른 디렉터리의 같은 이름 크롭은 서로 덮어쓴다. 있으면 ValueError."""
+    by_name: dict[str, list[Path]] = {}
+    for src in srcs:
+        by_name.setdefault(src.name, []).append(src)
+    dup = {n: ps for n, ps in by_name.items() if len(ps) > 1}
+    if dup:
+        lines = [f'  {n}: {", ".join(map(str, ps))}' for n, ps in sorted(dup.items())]
+        raise ValueError('같은 파일명의 크롭이 여러 디렉터리에 있음 — 이름을 바꾸세요\n'
+                         + '\n'.join(lines))
+
+
+def dedup(srcs: list[Path], out_dir: Path, **thresholds) -> dict:
+    """클러스터링 후 대표 파일을 out_dir 로 복사 → 매핑 테이블 반환."""
+    check_unique_names(srcs)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    d, p, sizes = hash_files(srcs)
+    clusters = []
+    mapping: dict[str, str] = {}
+    for members in cluster(d, p, **thresholds):
+        # 대표: 해상도 최대 → 같으면 파일명 순 (재실행 시 안정)
+        canon = max(members, key=lambda i: (sizes[i][0] * sizes[i][1], -members.index(i)))
+        names = [srcs[i].name for i in members]
+        dest = out_dir / srcs[canon].name
+        shutil.copy2(srcs[canon], dest)
+        for n in names:
+            mapping[n] = dest.name
+        clusters.append({'canonical': dest.name, 'members': names,
+                         'dhash': f'{int(d[canon]):016x}', 'phash': f'{int(p[canon]):016x}'})
+    return {'map': mapping, 'clusters': clusters}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('dirs', nargs='+', type=Path, help='JPEG 크롭 디렉터리')
+    ap.add_argument('--out', type=Path, default=ROOT / 'images_dedup')
+    ap.add_argument('--mapping', type=Path, default=MAPPING)
+    ap.add_argument('--max-dhash', type=int, default=10, help='dHash 해밍 거리 임계 (0~64)')
+    ap.add_argument('--max-phash', type=int, default=8, help='pHash 해밍 거리 임계 (0~64)')
+    args = ap.parse_args()
+
+    # 디렉터리·파일명 순 정렬 → 클러스터 내 순서와 대표 선택이 실행마다 동일
+    srcs = [p for d in args.dirs for p in sorted(d.glob('*.jpg'))]
+    try:
+        check_unique_names(srcs)
+    except ValueError as e:
+        ap.error(str(e))
+    result = dedup(srcs, args.out, max_dhash=args.max_dhash, max_phash=args.max_phash)
+    args.mapping.parent.mkdir(parents=True, exist_ok=True)
+    args.mapping.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    dup = [c for c in result['clusters'] if len(c['members']) > 1]
+    for c in dup:
+        print(f"  {c['canonical']} ← {', '.join(m for m in c['members'] if m != c['canonical'])}")
+    saved = sum(len(c['members']) - 1 for c in dup)
+    print(f'{len(srcs)}장 → {len(result["clusters"])}개 객체 (중복 {saved}장 제거)')
+    print(f'저장: {args.mapping}')
+
+
+if __name__ == '__main__':
+    main()
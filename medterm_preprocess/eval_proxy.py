@@ -0,0 +1,65 @@
+"""proxy 검출 회귀 하네스 — 원본 해상도 박스 대비 proxy 박스의 IoU 비교.
+
+각 proxy 크기(긴 변 px)마다 페이지별로 원본 검출 결과와 1:1 매칭(IoU 큰 순)
+하고 평균 IoU·최소 IoU·누락/초과 박스 수·페이지당 검출 시간을 출력한다.
+scale factor 는 이 표를 보고 정한다.
+
+사용:
+  python eval_proxy.py raw/ 1 300 --sizes 800 1000 1400
+"""
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+
+from auto_detect_figures import detect_figures_in_image, match_boxes
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('raw_dir')
+    ap.add_argument('start', nargs='?', type=int, default=1)
+    ap.add_argument('end', nargs='?', type=int, default=20)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[600, 800, 1000, 1400])
+    args = ap.parse_args()
+
+    raw_dir = Path(args.raw_dir)
+    # 페이지를 하나씩 디코딩해 원본·proxy 검출을 모두 돌리고 버린다
+    # (전 페이지를 원본 해상도로 들고 있지 않음 — 300쪽 ≈ 수 GB)
+    full_s, n_pages, n_ref = 0.0, 0, 0
+    stats = {size: {'ious': [], 'missed': 0, 'extra': 0, 's': 0.0} for size in args.sizes}
+    for n in range(args.start, args.end + 1):
+        src = raw_dir / f'page_{n:03d}.jpg'
+        img = cv2.imread(str(src)) if src.exists() else None
+        if img is None:
+            continue
+        n_pages += 1
+        t0 = time.perf_counter()
+        ref = detect_figures_in_image(img, n)
+        full_s += time.perf_counter() - t0
+        n_ref += len(ref)
+        for size, st in stats.items():
+            t0 = time.perf_counter()
+            proxy = detect_figures_in_image(img, n, proxy_long_side=size)
+            st['s'] += time.perf_counter() - t0
+            page_ious, m, e = match_boxes(ref, proxy)
+            st['ious'] += page_ious
+            st['missed'] += m
+            st['extra'] += e
+        del img
+    if not n_pages:
+        ap.error(f'{raw_dir} 에 page_NNN.jpg 없음')
+
+    print(f'{n_pages} pages, 원본 박스 {n_ref}개, 원본 {full_s / n_pages * 1000:.1f} ms/page')
+    print(f'{"long side":>9} {"mean IoU":>9} {"min IoU":>8} {"missed":>7} {"extra":>6} {"ms/page":>8}')
+    for size, st in stats.items():
+        ious = st['ious']
+        mean = sum(ious) / len(ious) if ious else 0.0
+        low = min(ious) if ious else 0.0
+        ms = st['s'] / n_pages * 1000
+        print(f'{size:>9} {mean:>9.3f} {low:>8.3f} {st["missed"]:>7} {st["extra"]:>6} {ms:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""학생별 셔플 시험지 배치 생성 — 문항 순서·객관식 보기 순서를 학생마다 다르게.
+
+여러 챕터의 exam_*.json 을 하나의 문제 은행으로 합치고, 학생마다
+  - 문항 순서 셔플 (1번부터 다시 번호)
+  - 객관식 choices 셔플 + answer 문자(A~E) 재매핑
+을 적용해 문제지 PDF 1개씩과 정답표를 만든다. 셔플은 (seed, 학생) 으로
+결정되므로 같은 입력이면 몇 번을 다시 돌려도 같은 시험지가 나온다.
+
+배치 동안 build_pdf.para_cache() 를 켜 두므로 문항 마크업은 한 번만 파싱되고
+학생 간에는 복사본만 만들어진다 — 두 번째 학생부터는 flowable 생성 비용이 거의 없다.
+
+--combined 는 학생 전원을 구역별 PDF 1개로 묶는다 (학생마다 쪽 번호 1부터).
+폰트 서브셋이 파일마다 임베드되므로, 인쇄소 업로드 용량이 학생 수에 비례해
+늘지 않는다. --font-report 로 출력별 임베드 폰트 크기를 확인할 수 있다.
+
+--omr 은 객관식·OX 문항용 OMR 답안지(omr_sheet.py)를 학생 순서대로 함께 만든다
+(sheet_no = 학생 인덱스). 스캔 채점은 omr_grade.py.
+
+출력:
+  - {out}/{학생}_문제지.pdf            (--combined 면 {out}/전체_문제지.pdf 1개)
+  - {out}/omr_답안지.pdf · .omr.json   (--omr)
+  - {out}/answer_keys.json   학생별 [{no, source, no_in_source, type, answer}]
+  - {out}/answer_keys.csv    같은 내용의 평면 표 (채점·엑셀용)
+
+사용:
+  python exam_batch.py output/exam_30q.json --students 40 --out output/batch
+  python exam_batch.py output/exam_ch*.json --roster class_a.txt --seed 2026-05
+  python exam_batch.py output/exam_30q.json --students 40 --combined --font-report
+"""
+import argparse
+import csv
+import json
+import random
+import time
+from pathlib import Path
+
+from build_pdf import embedded_font_bytes, para_cache, render_exam, render_sections
+from omr_sheet import render_sheets
+
+LETTERS = 'ABCDE'
+
+
+def load_bank(paths: list[Path]) -> list[dict]:
+    """여러 시험 JSON → 문항 목록. 각 문항에 _source(파일명)·_no(원 번호) 를 붙인다."""
+    bank = []
+    for path in paths:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+        for q in data['questions']:
+            bank.append({**q, '_source': Path(path).name, '_no': q['no']})
+    return bank
+
+
+def shuffle_for_student(bank: list[dict], student: str, seed: str) -> list[dict]:
+    """학생 1명 분 문항 목록 — 순서·보기 셔플, no 재부여. 원본 dict 는 건드리지 않는다."""
+    rng = random.Random(f'{seed}:{student}')
+    order = list(range(len(bank)))
+    rng.shuffle(order)
+    out = []
+    for new_no, idx in enumerate(order, 1):
+        q = {**bank[idx], 'no': new_no}
+        if q['type'] == '객관식' and 'choices' in q:
+            perm = list(range(len(q['choices'])))
+            rng.shuffle(perm)
+            q['choices'] = [q['choices'][i] for i in perm]
+            ans = q.get('answer')
+            if isinstance(ans, str) and len(ans) == 1 and ans in LETTERS:
+                q['answer'] = LETTERS[perm.index(LETTERS.index(ans))]
+        out.append(q)
+    return out
+
+
+def answer_key(questions: list[dict]) -> list[dict]:
+    return [{'no': q['no'], 'source': q['_source'], 'no_in_source': q['_no'],
+             'type': q['type'], 'answer': q.get('answer')} for q in questions]
+
+
+def build_batch(bank: list[dict], students: list[str], out_dir: Path, *,
+                seed: str, title: str, subtitle: str,
+                footer_text: str | None = None, range_label: str | None = None,
+                combined: bool = False, omr: bool = False) -> dict:
+    """학생별 문제지 PDF (combined 면 구역별 PDF 1개) + 정답표 생성 → 통계 dict."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    types = sorted({q['type'] for q in bank})
+    keys = {}
+    sections = []
+    sheets = []
+    outputs = []
+    t0 = time.perf_counter()
+    with para_cache():
+        for student in students:
+            questions = shuffle_for_student(bank, student, seed)
+            data = {'source': {'title': title, 'total': len(questions), 'types': types},
+                    'questions': questions}
+            opts = dict(title=title, subtitle=f'{subtitle} · {student}', with_answer=False,
+                        footer_text=(f'{footer_text or title} · {student}' if combined
+                                     else footer_text),
+                        range_label=range_label)
+            if combined:
+                sections.append({'data': data, **opts})
+            else:
+                outputs.append(out_dir / f'{student}_문제지.pdf')
+                render_exam(data, outputs[-1], **opts)
+            keys[student] = answer_key(questions)
+            if omr:
+                sheets.append({'student': student, 'questions': questions})
+        if combined:
+            outputs.append(out_dir / '전체_문제지.pdf')
+            render_sections(sections, outputs[-1], title=title)
+        if omr:
+            render_sheets(sheets, out_dir / 'omr_답안지', title=title)
+    elapsed = time.perf_counter() - t0
+
+    (out_dir / 'answer_keys.json').write_text(
+        json.dumps({'seed': seed, 'students': keys}, ensure_ascii=False, indent=2),
+        encoding='utf-8')
+    with open(out_dir / 'answer_keys.csv', 'w', newline='', encoding='utf-8-sig') as f:
+        w = csv.writer(f)
+        w.writerow(['student', 'no', 'source', 'no_in_source', 'type', 'answer'])
+        for student, rows in keys.items():
+            for r in rows:
+                ans = r['answer']
+                if not isinstance(ans, str):
+                    ans = json.dumps(ans, ensure_ascii=False)
+                w.writerow([student, r['no'], r['source'], r['no_in_source'], r['type'], ans])
+
+    return {'pdfs': len(students), 'questions': len(bank), 'seconds': elapsed,
+            'pdfs_per_sec': len(students) / elapsed if elapsed else 0.0,
+            'outputs': outputs}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('exams', nargs='+', type=Path, help='exam_*.json (여러 챕터 가능)')
+    g = ap.add_mutually_exclusive_group(required=True)
+    g.add_argument('--students', type=int, help='학생 수 (이름: s001, s002, ...)')
+    g.add_argument('--roster', type=Path, help='학생 이름 목록 파일 (한 줄에 한 명)')
+    ap.add_argument('--seed', default='medterm')
+    ap.add_argument('--out', type=Path, default=Path(__file__).resolve().parent / 'output' / 'batch')
+    ap.add_argument('--title', default='기초 의학용어 단원평가')
+    ap.add_argument('--subtitle', default='— 문제지 —')
+    ap.add_argument('--range-label', default=None)
+    ap.add_argument('--combined', action='store_true', help='학생 전원을 구역별 PDF 1개로')
+    ap.add_argument('--omr', action='store_true', help='객관식·OX OMR 답안지도 생성')
+    ap.add_argument('--font-report', action='store_true',
+                    help='출력별 임베드 폰트 바이트 합계 (PyMuPDF 필요)')
+    args = ap.parse_args()
+
+    if args.roster:
+        students = [s.strip() for s in args.roster.read_text(encoding='utf-8').splitlines() if s.strip()]
+    else:
+        students = [f's{i:03d}' for i in range(1, args.students + 1)]
+    bank = load_bank(args.exams)
+    stats = build_batch(bank, students, args.out, seed=args.seed,
+                        title=args.title, subtitle=args.subtitle, range_label=args.range_label,
+                        combined=args.combined, omr=args.omr)
+    print(f'{stats["pdfs"]}개 시험지 ({stats["questions"]}문항) — {stats["seconds"]:.2f}s, '
+          f'{stats["pdfs_per_sec"]:.1f} PDF/s')
+    if args.font_report:
+        font_kb = sum(sum(embedded_font_bytes(p).values()) for p in stats['outputs']) / 1024
+        file_kb = sum(p.stat().st_size for p in stats['outputs']) / 1024
+        print(f'  PDF {len(stats["outputs"])}개: 임베드 폰트 {font_kb:.1f} KB / 전체 {file_kb:.1f} KB')
+    print(f'저장: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
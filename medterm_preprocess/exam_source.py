@@ -0,0 +1,153 @@
+"""med_exam_items 데이터 소스 — SQLite/D1 export 에서 문항을 바로 PDF 로.
+
+중간 exam JSON 없이 DB 의 문항을 build_pdf.render_exam 에 흘려 넣는다.
+  - 챕터 단위:   med_exam_items WHERE chapter_id = ? ORDER BY no
+  - 응시 단위:   med_exam_attempts.item_ids_json 의 순서대로 (no 는 1부터 재부여)
+
+행은 fetchmany 로 묶어서 가져오고 (응시 단위는 IN (...) 일괄 조회),
+body_json·answer_json 은 행마다 한 번만 파싱한다. 표지에 필요한 총 문항 수·
+유형 목록은 blob 을 읽지 않는 집계 쿼리로 먼저 구하므로 questions 는
+제너레이터 그대로 render_question 까지 전달된다.
+
+입력 DB:
+  - SQLite 파일 (.db / .sqlite / .sqlite3)
+  - SQL 덤프 (.sql) — `wrangler d1 export` 결과 또는 seed_chapter01.py 출력.
+    med_exam_items CREATE 문이 없으면 059 마이그레이션으로 스키마를 먼저 만든다.
+
+사용:
+  python exam_source.py d1_export.sql --chapter med-basic-ch01 --out ch01_문제지.pdf
+  python exam_source.py d1_export.sql --attempt att-123 --answer --out att-123_해설.pdf
+"""
+import argparse
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+MIGRATION = ROOT.parent / 'workers' / 'migrations' / '059_medterm_system.sql'
+
+ITEM_COLUMNS = ('id', 'no', 'type', 'topic', 'difficulty', 'question',
+                'body_json', 'answer_json', 'explanation', 'figure_id')
+FETCH_BATCH = 200
+IN_CHUNK = 500  # SQLite 바인드 변수 한도(구버전 999) 이하
+
+
+def open_export(path: Path) -> sqlite3.Connection:
+    """SQLite 파일 또는 SQL 덤프 → 연결 (덤프는 메모리 DB 로 적재)."""
+    path = Path(path)
+    if path.suffix != '.sql':
+        return sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    conn = sqlite3.connect(':memory:')
+    dump = path.read_text(encoding='utf-8')
+    if not re.search(r'CREATE TABLE[^(]*\bmed_exam_items\b', dump, re.I):
+        conn.executescript(MIGRATION.read_text(encoding='utf-8'))
+    conn.executescript(dump)
+    return conn
+
+
+def row_to_question(row: tuple) -> dict:
+    """med_exam_items 행 → build_pdf 문항 dict (body_json 키를 최상위로 펼침)."""
+    r = dict(zip(ITEM_COLUMNS, row))
+    q = json.loads(r['body_json']) if r['body_json'] else {}
+    q.update(no=r['no'], type=r['type'], difficulty=r['difficulty'],
+             question=r['question'], answer=json.loads(r['answer_json']), _item_id=r['id'])
+    # NULL 선택 컬럼은 키 자체를 두지 않는다 (JSON 원본처럼 — 'explanation' in q 로 분기)
+    for key in ('topic', 'explanation', 'figure_id'):
+        if r[key] is not None:
+            q[key] = r[key]
+    return q
+
+
+def _select(where: str) -> str:
+    return f"SELECT {','.join(ITEM_COLUMNS)} FROM med_exam_items WHERE {where}"
+
+
+def iter_chapter(conn: sqlite3.Connection, chapter_id: str):
+    """챕터 문항을 no 순으로 하나씩 (FETCH_BATCH 행 단위 조회)."""
+    cur = conn.execute(_select('chapter_id = ? ORDER BY no'), (chapter_id,))
+    while rows := cur.fetchmany(FETCH_BATCH):
+        for row in rows:
+            yield row_to_question(row)
+
+
+def attempt_item_ids(conn: sqlite3.Connection, attempt_id: str) -> list[str]:
+    row = conn.execute('SELECT item_ids_json FROM med_exam_attempts WHERE id = ?',
+                       (attempt_id,)).fetchone()
+    if row is None:
+        raise KeyError(f'응시 없음: {attempt_id}')
+    return json.loads(row[0])
+
+
+def iter_items(conn: sqlite3.Connection, item_ids: list[str]):
+    """item_ids 순서대로 문항을 하나씩 — IN_CHUNK 개씩 일괄 조회, no 는 1부터 재부여."""
+    no = 0
+    for i in range(0, len(item_ids), IN_CHUNK):
+        chunk = item_ids[i:i + IN_CHUNK]
+        marks = ','.join('?' * len(chunk))
+        by_id = {row[0]: row for row in conn.execute(_select(f'id IN ({marks})'), chunk)}
+        for item_id in chunk:
+            if item_id not in by_id:
+                raise KeyError(f'문항 없음: {item_id}')
+            no += 1
+            q = row_to_question(by_id[item_id])
+            q['_no'], q['no'] = q['no'], no
+            yield q
+
+
+def _summary(conn: sqlite3.Connection, where: str, params) -> tuple[int, list[str]]:
+    """(총 문항 수, 등장 순 유형 목록) — body/answer blob 은 읽지 않는다."""
+    rows = conn.execute(f'SELECT type, COUNT(*), MIN(no) FROM med_exam_items WHERE {where} '
+                        f'GROUP BY type ORDER BY MIN(no)', params).fetchall()
+    return sum(n for _, n, _ in rows), [t for t, _, _ in rows]
+
+
+def chapter_exam(conn: sqlite3.Connection, chapter_id: str) -> dict:
+    """render_exam 용 시험 dict — questions 는 제너레이터."""
+    row = conn.execute('SELECT title FROM med_chapters WHERE id = ?', (chapter_id,)).fetchone()
+    total, types = _summary(conn, 'chapter_id = ?', (chapter_id,))
+    if not total:
+        raise KeyError(f'챕터 문항 없음: {chapter_id}')
+    return {'source': {'title': row[0] if row else chapter_id, 'total': total, 'types': types},
+            'questions': iter_chapter(conn, chapter_id)}
+
+
+def attempt_exam(conn: sqlite3.Connection, attempt_id: str) -> dict:
+    """응시(med_exam_attempts) 1건의 시험 dict — 문항 순서는 item_ids_json 그대로."""
+    ids = attempt_item_ids(conn, attempt_id)
+    types: list[str] = []
+    for i in range(0, len(ids), IN_CHUNK):
+        chunk = ids[i:i + IN_CHUNK]
+        for (t,) in conn.execute(f"SELECT DISTINCT type FROM med_exam_items "
+                                 f"WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+            if t not in types:
+                types.append(t)
+    return {'source': {'title': attempt_id, 'total': len(ids), 'types': types},
+            'questions': iter_items(conn, ids)}
+
+
+def main():
+    from build_pdf import render_exam
+    ap = argparse.ArgumentParser()
+    ap.add_argument('db', type=Path, help='SQLite 파일 또는 D1 export .sql')
+    g = ap.add_mutually_exclusive_group(required=True)
+    g.add_argument('--chapter', help='med_chapters.id (예: med-basic-ch01)')
+    g.add_argument('--attempt', help='med_exam_attempts.id')
+    ap.add_argument('--answer', action='store_true', help='정답·해설 포함')
+    ap.add_argument('--out', type=Path, required=True)
+    ap.add_argument('--title', default=None, help='생략 시 챕터 제목 / 응시 ID')
+    ap.add_argument('--range-label', default=None)
+    args = ap.parse_args()
+
+    conn = open_export(args.db)
+    data = (chapter_exam(conn, args.chapter) if args.chapter
+            else attempt_exam(conn, args.attempt))
+    title = args.title or data['source']['title']
+    label = '정답·해설' if args.answer else '문제지'
+    render_exam(data, args.out, title=title,
+                subtitle=f"— 단원평가 {data['source']['total']}문항 ({label}) —",
+                with_answer=args.answer, range_label=args.range_label)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""그림 크롭 → 폭별 WebP(+선택 AVIF) 파생본 생성 + 크기 manifest.
+
+입력: crop_figures.py (images/) · auto_detect_figures.py (images_auto/) 의 JPEG 크롭
+출력:
+  - {out}/{stem}.{variant}.{webp|avif}   variant = thumb / mobile / full
+  - output/figure_derivatives.json       원본 파일명 → width/height + 파생본 목록
+
+원본보다 넓어지는 variant 는 만들지 않는다 (업스케일 금지 — full 로 대체).
+seed_chapter01.py 는 이 manifest 로 med_figures.width/height 를 채운다.
+
+사용:
+  python figure_derivatives.py images/ images_auto/ --out derivatives/ [--avif]
+"""
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, features
+
+ROOT = Path(__file__).resolve().parent
+MANIFEST = ROOT / 'output' / 'figure_derivatives.json'
+
+# (variant, 최대 폭 px) — None 은 원본 폭
+VARIANTS = (('thumb', 320), ('mobile', 800), ('full', None))
+QUALITY = {'webp': 80, 'avif': 60}
+
+
+def make_derivatives(src: Path, out_dir: Path, *,
+                     formats: tuple[str, ...] = ('webp',)) -> dict:
+    """크롭 1장의 파생본 생성 → manifest 항목 반환."""
+    img = Image.open(src)
+    img.load()
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    w, h = img.size
+    entry = {'width': w, 'height': h, 'variants': []}
+    for name, max_w in VARIANTS:
+        if max_w and max_w >= w:
+            continue
+        v = img.resize((max_w, round(h * max_w / w)), Image.LANCZOS) if max_w else img
+        for fmt in formats:
+            dest = out_dir / f'{src.stem}.{name}.{fmt}'
+            opts = {'method': 6} if fmt == 'webp' else {}
+            v.save(dest, fmt.upper(), quality=QUALITY[fmt], **opts)
+            entry['variants'].append({
+                'name': name, 'format': fmt,
+                'width': v.width, 'height': v.height,
+                'file': dest.name, 'bytes': dest.stat().st_size,
+            })
+    return entry
+
+
+def build(srcs: list[Path], out_dir: Path, *, formats: tuple[str, ...] = ('webp',),
+          workers: int = 4) -> dict[str, dict]:
+    """여러 크롭을 스레드 풀로 변환 → {원본 파일명: manifest 항목}."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        entries = pool.map(lambda p: make_derivatives(p, out_dir, formats=formats), srcs)
+        return {src.name: e for src, e in zip(srcs, entries)}
+
+
+def load_manifest(path: Path = MANIFEST) -> dict[str, dict]:
+    """기존 manifest (없으면 빈 dict) — 새 결과를 병합해 다시 쓴다."""
+    if not Path(path).exists():
+        return {}
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('dirs', nargs='+', type=Path, help='JPEG 크롭 디렉터리')
+    ap.add_argument('--out', type=Path, default=ROOT / 'derivatives')
+    ap.add_argument('--manifest', type=Path, default=MANIFEST)
+    ap.add_argument('--avif', action='store_true', help='AVIF 도 함께 생성')
+    ap.add_argument('--workers', type=int, default=4)
+    args = ap.parse_args()
+
+    formats = ('webp',)
+    if args.avif:
+        if features.check('avif'):
+            formats += ('avif',)
+        else:
+            print('  [warn] 이 Pillow 빌드는 AVIF 미지원 — WebP 만 생성')
+
+    srcs = sorted(p for d in args.dirs for p in d.glob('*.jpg'))
+    manifest = load_manifest(args.manifest)
+    manifest.update(build(srcs, args.out, formats=formats, workers=args.workers))
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    args.manifest.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    src_bytes = sum(p.stat().st_size for p in srcs)
+    for fmt in formats:
+        for name, _ in VARIANTS:
+            total = sum(v['bytes'] for n in (p.name for p in srcs)
+                        for v in manifest[n]['variants'] if v['name'] == name and v['format'] == fmt)
+            print(f'  {fmt:<5} {name:<7} {total / 1024:>9.1f} KB')
+    print(f'  원본 JPEG     {src_bytes / 1024:>9.1f} KB ({len(srcs)}장)')
+    print(f'저장: {args.manifest}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""OMR 답안지 일괄 판독 — OpenCV/NumPy. omr_sheet.py 답안지 스캔 → 학생별 응답.
+
+처리 (스캔 1장):
+  1. 그레이스케일 Otsu 이진화 → 모서리 fiducial 정사각형 4개 검출
+  2. fiducial 중심 → 표준 좌표(PX_PER_MM)로 원근 보정 (빨강 채널만)
+  3. ID 띠·버블 중심의 원판 영역 평균 농도를 한 번의 NumPy 인덱싱으로 측정
+     (버블 안 드롭아웃 글자는 빨강 채널에서 흰색 → 농도에 안 잡힘)
+  4. ID 띠 디코딩 실패 시 180° 회전해 재시도 (거꾸로 넣은 스캔)
+
+응답 규칙 (문항별): 가장 진한 버블 농도 ≥ FILL_MIN 이면 그 보기.
+두 번째 버블도 진하면 (≥ FILL_MIN × AMBIGUOUS) 중복 표기 — 응답 없음으로 두고 flag.
+
+출력 JSON:
+  {"students": {학생: {"attempt_id", "sheet_no",
+                       "responses": [{"no", "item_id", "type", "response_json"}],
+                       "flags": [{"no", "reason", "fills"}]}},
+   "unreadable": [스캔 경로...]}
+response_json 은 med_exam_responses.response_json 과 같은 JSON 문자열
+(객관식 '"B"', OX '"O"', 미표기 'null').
+
+사용:
+  python omr_grade.py scans/*.jpg --manifest output/batch/omr_답안지.omr.json \\
+      --out output/batch/omr_responses.json --workers 4
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from omr_sheet import (BUBBLE_R, FID_CENTERS, FID_SIZE, ID_CELL, LETTERS, PAGE_H, PAGE_W,
+                       SLOTS, decode_id, id_centers, slot_centers)
+
+PX_PER_MM = 4
+FILL_MIN = 0.45
+AMBIGUOUS = 0.6
+
+
+def _disc(radius_px: float) -> tuple[np.ndarray, np.ndarray]:
+    r = int(radius_px)
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    keep = dx * dx + dy * dy <= radius_px * radius_px
+    return dy[keep], dx[keep]
+
+
+# 표준 좌표 샘플링 위치 (모듈 로드 시 1회) — 버블 테두리는 빼고 안쪽 60% 만
+_SLOT_XY = np.round(np.array(slot_centers()) * PX_PER_MM).astype(np.int32)
+_ID_XY = np.round(np.array(id_centers()) * PX_PER_MM).astype(np.int32)
+_SLOT_DISC = _disc(BUBBLE_R * 0.6 * PX_PER_MM)
+_ID_DISC = _disc(ID_CELL * 0.3 * PX_PER_MM)
+_DST = np.float32([[x * PX_PER_MM, y * PX_PER_MM] for x, y in FID_CENTERS])
+_SIZE = (int(PAGE_W * PX_PER_MM), int(PAGE_H * PX_PER_MM))
+
+
+def find_fiducials(gray: np.ndarray) -> np.ndarray | None:
+    """모서리 fiducial 4개 중심 (TL, TR, BL, BR 순, float32) | None."""
+    h, w = gray.shape
+    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    contours, _ = cv2.findContours(bw, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    expect = FID_SIZE / PAGE_W * w  # 예상 한 변 (px)
+    cands = []
+    for c in contours:
+        x, y, cw, ch = cv2.boundingRect(c)
+        if not (0.6 * expect <= cw <= 1.5 * expect and 0.6 * expect <= ch <= 1.5 * expect):
+            continue
+        if cv2.contourArea(c) < 0.8 * cw * ch:
+            continue
+        cands.append((x + cw / 2, y + ch / 2))
+    if len(cands) < 4:
+        return None
+    pts = np.float32(cands)
+    corners = np.float32([[0, 0], [w, 0], [0, h], [w, h]])
+    picked = [pts[np.argmin(np.hypot(*(pts - c).T))] for c in corners]
+    if len({tuple(p) for p in picked}) < 4:
+        return None
+    return np.float32(picked)
+
+
+def _sample(page: np.ndarray, xy: np.ndarray, disc) -> np.ndarray:
+    dy, dx = disc
+    return page[xy[:, 1, None] + dy, xy[:, 0, None] + dx].mean(axis=1)
+
+
+def read_sheet(img: np.ndarray) -> tuple[int, int, np.ndarray] | None:
+    """BGR 스캔 1장 → (sheet_no, page, 버블 농도 [PER_PAGE*SLOTS]) | None (판독 불가)."""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    src = find_fiducials(gray)
+    if src is None:
+        return None
+    m = cv2.getPerspectiveTransform(src, _DST)
+    red = cv2.warpPerspective(img[:, :, 2], m, _SIZE, flags=cv2.INTER_AREA,
+                              borderValue=255)
+    # 종이 흰색 기준 농도 0~1 (스캔 밝기 차이 보정)
+    white = max(float(np.percentile(red, 95)), 1.0)
+    for attempt in range(2):
+        dark = np.clip(1.0 - red.astype(np.float32) / white, 0.0, 1.0)
+        bits = [int(v >= 0.5) for v in _sample(dark, _ID_XY, _ID_DISC)]
+        ident = decode_id(bits)
+        if ident is not None:
+            return ident[0], ident[1], _sample(dark, _SLOT_XY, _SLOT_DISC)
+        red = cv2.rotate(red, cv2.ROTATE_180)  # fiducial 은 대칭 — 거꾸로 스캔 재시도
+    return None
+
+
+def read_file(path: str):
+    """워커용 — 경로 → (path, read_sheet 결과)."""
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    return path, (read_sheet(img) if img is not None else None)
+
+
+def interpret(fills: np.ndarray, item: dict) -> tuple[str | None, str | None]:
+    """한 문항의 버블 농도 → (응답 문자 | None, flag 사유 | None)."""
+    n = item['n'] if item['type'] == '객관식' else 2
+    f = fills[:n]
+    order = np.argsort(f)[::-1]
+    best = f[order[0]]
+    if best < FILL_MIN:
+        return None, None
+    if n > 1 and f[order[1]] >= FILL_MIN * AMBIGUOUS:
+        return None, 'multiple'
+    return ('OX' if item['type'] == 'OX' else LETTERS)[order[0]], None
+
+
+def grade(paths: list[str], manifest: dict, *, workers: int = 1) -> dict:
+    """스캔 목록 → 학생별 응답 dict (모듈 docstring 의 출력 JSON)."""
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            reads = list(ex.map(read_file, paths, chunksize=8))
+    else:
+        reads = [read_file(p) for p in paths]
+
+    students = {}
+    unreadable = []
+    for path, res in reads:
+        sheet = manifest['sheets'].get(str(res[0])) if res else None
+        if sheet is None:
+            unreadable.append(path)
+            continue
+        sheet_no, page, fills = res
+        out = students.setdefault(sheet['student'], {
+            'attempt_id': sheet.get('attempt_id'), 'sheet_no': sheet_no,
+            'responses': [], 'flags': []})
+        per_page = len(fills) // SLOTS
+        items = sheet['items'][page * per_page:(page + 1) * per_page]
+        for pos, item in enumerate(items):
+            slot = fills[pos * SLOTS:(pos + 1) * SLOTS]
+            ans, flag = interpret(slot, item)
+            out['responses'].append({'no': item['no'], 'item_id': item.get('item_id'),
+                                     'type': item['type'],
+                                     'response_json': json.dumps(ans, ensure_ascii=False)})
+            if flag:
+                out['flags'].append({'no': item['no'], 'reason': flag,
+                                     'fills': [round(float(v), 2) for v in slot]})
+    for out in students.values():
+        out['responses'].sort(key=lambda r: r['no'])
+    return {'students': students, 'unreadable': unreadable}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('scans', nargs='+', type=Path, help='스캔 이미지 (JPEG/PNG)')
+    ap.add_argument('--manifest', type=Path, required=True, help='omr_sheet.py 의 .omr.json')
+    ap.add_argument('--out', type=Path, required=True)
+    ap.add_argument('--workers', type=int, default=1,
+                    help=f'판독 프로세스 수 (CPU {os.cpu_count()}개)')
+    args = ap.parse_args()
+
+    manifest = json.loads(args.manifest.read_text(encoding='utf-8'))
+    t0 = time.perf_counter()
+    result = grade([str(p) for p in args.scans], manifest, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(result, ensure_ascii=False, indent=1), encoding='utf-8')
+
+    n_flags = sum(len(s['flags']) for s in result['students'].values())
+    print(f'{len(args.scans)}장 판독 — 학생 {len(result["students"])}명, '
+          f'flag {n_flags}건, 판독 불가 {len(result["unreadable"])}장')
+    print(f'  {elapsed:.2f}s ({len(args.scans) / elapsed * 60:.0f}장/분)')
+    for p in result['unreadable']:
+        print(f'  [unreadable] {p}')
+    print(f'저장: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
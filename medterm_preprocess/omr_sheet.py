@@ -0,0 +1,180 @@
+"""OMR 답안지 — 객관식·OX 문항용 기계 판독 답안지 PDF.
+
+문제지(build_pdf)의 손글씨 답란과 별도로, 객관식·OX 문항만 모아 버블
+그리드로 찍는다. 채점은 omr_grade.py (스캔 이미지 일괄 판독).
+
+레이아웃 (A4, mm, 좌상단 원점):
+  - 네 모서리 fiducial (검은 정사각형 8mm) — 판독 시 원근 보정 기준점
+  - ID 띠: 칸 21개 = 시작 가드(1) + sheet_no 16bit + page 3bit + 짝수 패리티
+  - 버블 그리드: 3열 × 25행 = 페이지당 75문항, 문항당 버블 최대 5개
+    (객관식 A~E / OX 는 O·X 두 칸). 버블 안 글자는 연한 빨강(드롭아웃)으로
+    찍어 판독 시 빨강 채널에서 사라지게 한다.
+
+다른 유형(단답형·매칭·빈칸·용어분해)은 답안지에 싣지 않는다 — 수기 채점.
+
+출력:
+  - {out}.pdf              학생(시트)마다 1~N 페이지
+  - {out}.omr.json         sheet_no → 학생·attempt·문항 목록 (omr_grade.py 입력)
+
+사용:
+  python omr_sheet.py output/exam_30q.json --out output/omr/ch01_답안지
+"""
+import argparse
+import json
+from pathlib import Path
+
+from reportlab.lib.colors import HexColor, black
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas as pdfcanvas
+
+from build_pdf import register_fonts
+
+OMR_TYPES = ('객관식', 'OX')
+LETTERS = 'ABCDE'
+
+PAGE_W, PAGE_H = 210.0, 297.0
+FID_SIZE = 8.0
+FID_CENTERS = ((14.0, 14.0), (196.0, 14.0), (14.0, 283.0), (196.0, 283.0))  # TL TR BL BR
+ID_BITS = 21
+ID_X0, ID_Y, ID_PITCH, ID_CELL = 20.0, 42.0, 6.0, 4.0
+ROWS, COLS, SLOTS = 25, 3, 5
+PER_PAGE = ROWS * COLS
+GRID_X0, GRID_Y0, COL_PITCH, ROW_PITCH = 22.0, 62.0, 60.0, 8.4
+BUBBLE_DX, BUBBLE_PITCH, BUBBLE_R = 12.0, 8.5, 2.6
+DROPOUT = HexColor('#F4A6A6')
+
+
+def slot_centers() -> list[tuple[float, float]]:
+    """페이지의 모든 버블 중심 (mm) — 인덱스 = 위치 × SLOTS + 버블."""
+    out = []
+    for pos in range(PER_PAGE):
+        col, row = divmod(pos, ROWS)
+        x = GRID_X0 + col * COL_PITCH + BUBBLE_DX
+        y = GRID_Y0 + row * ROW_PITCH
+        out.extend((x + k * BUBBLE_PITCH, y) for k in range(SLOTS))
+    return out
+
+
+def id_centers() -> list[tuple[float, float]]:
+    return [(ID_X0 + i * ID_PITCH + ID_CELL / 2, ID_Y + ID_CELL / 2) for i in range(ID_BITS)]
+
+
+def encode_id(sheet_no: int, page: int) -> list[int]:
+    if not (0 <= sheet_no < 1 << 16 and 0 <= page < 1 << 3):
+        raise ValueError(f'sheet_no/page 범위 초과: {sheet_no}/{page}')
+    bits = [1] + [(sheet_no >> i) & 1 for i in range(16)] + [(page >> i) & 1 for i in range(3)]
+    return bits + [sum(bits) % 2]
+
+
+def decode_id(bits: list[int]) -> tuple[int, int] | None:
+    """ID 띠 비트 → (sheet_no, page). 가드·패리티가 맞지 않으면 None (뒤집힌 스캔 등)."""
+    if len(bits) != ID_BITS or bits[0] != 1 or sum(bits[:-1]) % 2 != bits[-1]:
+        return None
+    sheet_no = sum(b << i for i, b in enumerate(bits[1:17]))
+    page = sum(b << i for i, b in enumerate(bits[17:20]))
+    return sheet_no, page
+
+
+def omr_items(questions: list[dict]) -> list[dict]:
+    """문항 목록 → 답안지에 실을 항목 (객관식·OX 만, 문항 순서 유지)."""
+    items = []
+    for q in questions:
+        if q['type'] not in OMR_TYPES:
+            continue
+        n = len(q.get('choices', ())) if q['type'] == '객관식' else 2
+        item = {'no': q['no'], 'item_id': q.get('_item_id'), 'type': q['type'],
+                'n': min(n, SLOTS) or 4}
+        if '_source' in q:  # exam_batch 셔플 문항 — 원 출처 (정답표와 대조용)
+            item.update(source=q['_source'], no_in_source=q['_no'])
+        items.append(item)
+    return items
+
+
+def _y(v: float) -> float:
+    # 레이아웃 mm(좌상단 원점) → reportlab pt(좌하단 원점)
+    return (PAGE_H - v) * mm
+
+
+def draw_page(c, items: list[dict], sheet_no: int, page: int, *, title: str, student: str):
+    """답안지 1페이지 (items 는 이 페이지의 최대 PER_PAGE 개)."""
+    c.setFillColor(black)
+    for x, y in FID_CENTERS:
+        c.rect((x - FID_SIZE / 2) * mm, _y(y + FID_SIZE / 2), FID_SIZE * mm, FID_SIZE * mm,
+               stroke=0, fill=1)
+    c.setFont('NanumB', 13)
+    c.drawString(24 * mm, _y(24), title)
+    c.setFont('Nanum', 10)
+    c.drawString(24 * mm, _y(32), f'이름: {student}')
+    c.drawRightString(186 * mm, _y(32), f'시트 {sheet_no} · {page + 1}쪽')
+    for bit, (x, y) in zip(encode_id(sheet_no, page), id_centers()):
+        c.setLineWidth(0.4)
+        c.rect((x - ID_CELL / 2) * mm, _y(y + ID_CELL / 2), ID_CELL * mm, ID_CELL * mm,
+               stroke=1, fill=bit)
+    c.setFont('Nanum', 8)
+    c.drawString(ID_X0 * mm, _y(ID_Y + ID_CELL + 5),
+                 '객관식·OX 답은 해당 칸을 컴퓨터용 사인펜/연필로 꽉 채워 칠하세요. (1문항 1칸)')
+
+    centers = slot_centers()
+    for pos, item in enumerate(items):
+        x0, y0 = centers[pos * SLOTS]
+        c.setFillColor(black)
+        c.setFont('NanumB', 9)
+        c.drawRightString((x0 - 5) * mm, _y(y0 + 1.2), str(item['no']))
+        labels = 'OX' if item['type'] == 'OX' else LETTERS[:item['n']]
+        for k, label in enumerate(labels):
+            x, y = centers[pos * SLOTS + k]
+            c.setStrokeColor(black)
+            c.setLineWidth(0.5)
+            c.circle(x * mm, _y(y), BUBBLE_R * mm, stroke=1, fill=0)
+            c.setFillColor(DROPOUT)
+            c.setFont('Helvetica', 7)
+            c.drawCentredString(x * mm, _y(y + 1.0), label)
+
+
+def render_sheets(sheets: list[dict], out_base: Path, *, title: str) -> Path:
+    """sheets: [{'student', 'attempt_id'?, 'questions'}] → PDF 1개 + manifest.
+
+    sheet_no 는 sheets 의 인덱스. 문항이 PER_PAGE 를 넘으면 시트가 여러 쪽이 된다.
+    """
+    register_fonts()
+    out_base.parent.mkdir(parents=True, exist_ok=True)
+    pdf_path = out_base.with_suffix('.pdf')
+    c = pdfcanvas.Canvas(str(pdf_path), pagesize=A4)
+    c.setTitle(title)
+    manifest = {'title': title, 'sheets': {}}
+    for sheet_no, sheet in enumerate(sheets):
+        items = omr_items(sheet['questions'])
+        pages = max(1, -(-len(items) // PER_PAGE))
+        for page in range(pages):
+            draw_page(c, items[page * PER_PAGE:(page + 1) * PER_PAGE], sheet_no, page,
+                      title=title, student=sheet['student'])
+            c.showPage()
+        manifest['sheets'][str(sheet_no)] = {
+            'student': sheet['student'], 'attempt_id': sheet.get('attempt_id'),
+            'pages': pages, 'items': items,
+        }
+    c.save()
+    manifest_path = out_base.with_suffix('.omr.json')
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding='utf-8')
+    print(f'  saved {pdf_path.name} ({len(sheets)}장) + {manifest_path.name}')
+    return manifest_path
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('exam', type=Path, help='exam JSON')
+    ap.add_argument('--out', type=Path, required=True, help='출력 경로 (확장자 제외)')
+    ap.add_argument('--title', default=None)
+    ap.add_argument('--students', type=int, default=1, help='같은 답안지를 몇 장 (sheet_no 만 다름)')
+    args = ap.parse_args()
+
+    data = json.loads(args.exam.read_text(encoding='utf-8'))
+    title = args.title or data.get('source', {}).get('title', args.exam.stem)
+    sheets = [{'student': f's{i:03d}', 'questions': data['questions']}
+              for i in range(1, args.students + 1)]
+    render_sheets(sheets, args.out, title=title)
+
+
+if __name__ == '__main__':
+    main()
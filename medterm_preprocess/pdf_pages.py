@@ -0,0 +1,73 @@
+"""원본 PDF → 페이지 ndarray 스트리밍 — raw/page_NNN.jpg 중간 파일 없이.
+
+PyMuPDF(fitz)로 페이지를 렌더링하는 producer 스레드가 크기 제한 큐에
+BGR ndarray 를 넣고, 호출 측은 generator 로 하나씩 꺼내 쓴다. 큐가 차면
+렌더링이 멈추므로 책 길이와 무관하게 메모리에는 최대 prefetch+2 장만 있다
+(큐 prefetch 장 + 호출 측이 쓰는 1장 + put 을 기다리는 producer 의 1장).
+JPEG 왕복이 없어 화질 손실도 없다.
+
+페이지 번호는 1부터 — 기존 page_NNN.jpg 번호와 동일하게 맞춘다.
+"""
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import cv2
+import fitz
+import numpy as np
+
+_DONE = object()
+
+
+def render_page(page: 'fitz.Page', dpi: int = 300) -> np.ndarray:
+    """PDF 페이지 1장 → OpenCV BGR ndarray."""
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+    rgb = np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width, 3)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+def iter_pdf_pages(pdf_path: Path, page_range: tuple[int, int] | None = None, *,
+                   dpi: int = 300, prefetch: int = 4) -> Iterator[tuple[int, np.ndarray]]:
+    """(page_no, BGR ndarray) 를 순서대로 yield. page_range 는 1-based 양끝 포함."""
+    q: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            with fitz.open(str(pdf_path)) as doc:
+                start, end = page_range or (1, doc.page_count)
+                for n in range(max(start, 1), min(end, doc.page_count) + 1):
+                    if stop.is_set():
+                        return
+                    item = (n, render_page(doc[n - 1], dpi))
+                    while not stop.is_set():
+                        try:
+                            q.put(item, timeout=0.2)
+                            break
+                        except queue.Full:
+                            continue
+        except Exception as e:  # 소비 측에서 다시 raise
+            q.put(e)
+        finally:
+            q.put(_DONE)
+
+    t = threading.Thread(target=produce, name='pdf-pages', daemon=True)
+    t.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # 소비 측이 중간에 멈춘 경우(break·예외) producer 정리
+        stop.set()
+        while t.is_alive():
+            try:
+                q.get(timeout=0.2)
+            except queue.Empty:
+                pass
+        t.join()
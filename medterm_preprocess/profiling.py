@@ -0,0 +1,113 @@
+"""medterm_preprocess 공용 stage 타이밍·메모리 계측.
+
+활성화:
+  - 환경변수 MEDTERM_PROFILE=1            → 종료 시 JSON 리포트를 stderr 로
+  - 환경변수 MEDTERM_PROFILE=report.json  → 해당 파일로
+  - 각 스크립트의 --profile [PATH]         → 위와 동일 (add_cli_flag / init_from_args)
+
+사용:
+    from profiling import stage
+    with stage('detect.dilate'):
+        ...
+
+비활성 상태의 stage() 는 아무것도 기록하지 않는다 (오버헤드 ≈ 함수 호출 1회).
+리포트: stage 별 count / total_s / p50_ms / p95_ms / peak_rss_mb
+(peak_rss_mb 는 해당 stage 종료 시점까지의 프로세스 최대 RSS).
+
+프로세스 풀 워커 안의 stage 는 워커 프로세스에만 기록되므로, 단계별
+수치가 필요하면 workers=1 로 실행한다.
+"""
+import atexit
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+ENV = 'MEDTERM_PROFILE'
+_OWNER_ENV = 'MEDTERM_PROFILE_OWNER'  # 리포트를 쓰는 프로세스 (spawn 된 워커는 제외)
+
+_enabled = False
+_report_path: str | None = None
+_samples: dict[str, list[float]] = {}
+_peak_kb: dict[str, int] = {}
+
+
+def _rss_kb() -> int:
+    # Linux ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def enable(report_path: str | None = None) -> None:
+    """계측 시작. report_path 가 없으면 종료 시 stderr 로 출력."""
+    global _enabled, _report_path
+    if not _enabled:
+        atexit.register(_write_at_exit)
+        os.environ.setdefault(_OWNER_ENV, str(os.getpid()))
+    _enabled = True
+    _report_path = report_path
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def stage(name: str):
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _samples.setdefault(name, []).append(time.perf_counter() - t0)
+        _peak_kb[name] = max(_peak_kb.get(name, 0), _rss_kb())
+
+
+def _pct(sorted_vals: list[float], q: float) -> float:
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+def report() -> dict:
+    stages = {}
+    for name, vals in _samples.items():
+        vals = sorted(vals)
+        stages[name] = {
+            'count': len(vals),
+            'total_s': round(sum(vals), 4),
+            'p50_ms': round(_pct(vals, 0.50) * 1000, 3),
+            'p95_ms': round(_pct(vals, 0.95) * 1000, 3),
+            'peak_rss_mb': round(_peak_kb[name] / 1024, 1),
+        }
+    return {'script': os.path.basename(sys.argv[0]),
+            'peak_rss_mb': round(_rss_kb() / 1024, 1),
+            'stages': stages}
+
+
+def _write_at_exit() -> None:
+    if os.environ.get(_OWNER_ENV) != str(os.getpid()) or not _samples:
+        return
+    text = json.dumps(report(), ensure_ascii=False, indent=2)
+    if _report_path:
+        with open(_report_path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f'  [profile] 저장: {_report_path}', file=sys.stderr)
+    else:
+        print(text, file=sys.stderr)
+
+
+def add_cli_flag(ap) -> None:
+    ap.add_argument('--profile', nargs='?', const='-', default=None, metavar='PATH',
+                    help='stage 타이밍 JSON 리포트 (PATH 생략 시 stderr)')
+
+
+def init_from_args(args) -> None:
+    if getattr(args, 'profile', None):
+        enable(None if args.profile == '-' else args.profile)
+
+
+_env = os.environ.get(ENV)
+if _env and _env not in ('0', 'false'):
+    enable(None if _env in ('1', 'true') else _env)
@@ -0,0 +1,432 @@
+"""교재 시드 엔진 — 교재 manifest(JSON) → 전 챕터 SQL INSERT (+ NDJSON).
+
+manifest (books/med-basic.json 참고, 경로는 manifest 기준 상대경로):
+  {"id", "title", "publisher"?, "field"?, "derivatives"?, "dedup"?,
+   "chapters": [{"no", "id"?, "title", "page_start", "page_end", "objectives"?,
+                 "pages", "exam", "item_prefix"?,
+                 "scan_pages": {"parts", "etymology", "plurals"},   # 없는 키는 건너뜀
+                 "figures": [{"id", "label", "caption", "type", "file"}],
+                 "labels": [{"figure", "prefix"?, "anchors": [[결합형, 텍스트, x, y], ...]}]}]}
+
+처리:
+  1. 챕터마다 독립 작업(chapter_seed) — 프로세스 풀에서 병렬로 행을 만든다.
+  2. manifest·챕터 순서대로 병합 — 테이블·id 전역 색인으로 같은 행은 처음 것만 남긴다.
+     단어 요소 id 는 (role, value) 슬러그라 여러 챕터·교재가 쓰는 요소도 한 번만
+     들어가고, chapter_id 는 처음 쓴 챕터가 갖는다 (순차 INSERT OR IGNORE 와 같은 결과).
+     병합은 작업 순서만 따르므로 --workers 와 관계없이 출력이 같다.
+
+행은 테이블(컬럼 구성)별로 모아 다중 행 INSERT OR IGNORE ... VALUES (...),(...)
+배치로 낸다. 배치 크기는 D1 한도 안 — 바인딩 파라미터 D1_MAX_PARAMS 개,
+문장 길이 D1_MAX_SQL_BYTES — 로 자른다.
+
+사용:
+  python seed_book.py books/med-basic.json --out output/seed_med-basic.sql --workers 8
+  python seed_book.py books/*.json --out output/seed_all.sql --ndjson output/seed_all.ndjson
+  python seed_book.py books/med-basic.json --chapters 1 2 3 --out output/seed_ch01-03.sql
+
+스키마: workers/migrations/059_medterm_system.sql 참조
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import profiling
+from profiling import stage
+
+ROOT = Path(__file__).resolve().parent
+DERIVATIVES_JSON = ROOT / 'output' / 'figure_derivatives.json'  # figure_derivatives.py 출력
+DEDUP_JSON = ROOT / 'output' / 'figure_dedup.json'               # dedup_figures.py 출력
+
+# D1 한도 (wrangler d1 execute / prepared statement)
+D1_MAX_PARAMS = 100         # 쿼리당 바인딩 파라미터
+D1_MAX_SQL_BYTES = 100_000  # SQL 문 1개 길이
+
+# 출력 테이블 순서 — 부모(FK 대상)가 자식보다 먼저
+TABLE_ORDER = ('med_books', 'med_chapters', 'med_word_parts', 'med_terms', 'med_term_parts',
+               'med_exam_items', 'med_figures', 'med_figure_labels')
+
+
+def sql_str(s):
+    """SQL 문자열 리터럴 — None은 NULL, 작은따옴표는 이스케이프."""
+    if s is None:
+        return 'NULL'
+    return "'" + str(s).replace("'", "''") + "'"
+
+
+def sql_int(n):
+    return 'NULL' if n is None else str(int(n))
+
+
+def sql_lit(v):
+    """파이썬 값 → SQL 리터럴 (str·None 은 sql_str, 숫자는 그대로)."""
+    if v is None or isinstance(v, str):
+        return sql_str(v)
+    return str(v)
+
+
+def slugify_part(role: str, value: str) -> str:
+    """'cardi/o' → 'wp-r-cardi-o'"""
+    cleaned = re.sub(r'[^a-zA-Z0-9]+', '-', value).strip('-').lower()
+    return f'wp-{role}-{cleaned}'
+
+
+def slugify_term(term: str) -> str:
+    cleaned = re.sub(r'[^a-zA-Z0-9-]+', '-', term).strip('-').lower()
+    return f'mt-{cleaned}'
+
+
+class SeedWriter:
+    """시드 행 수집 → 테이블별 다중 행 INSERT 배치.
+
+    행은 (테이블, 컬럼 튜플) 그룹에 넣은 순서대로 쌓인다. 그룹은 TABLE_ORDER 순
+    (같은 테이블 안에서는 처음 등장한 순)으로 내므로 부모 테이블(단어 요소·용어·
+    그림)이 자식(링크·라벨)보다 먼저 나온다. UPDATE 는 모든 INSERT 뒤.
+    """
+
+    def __init__(self, *, max_params: int = D1_MAX_PARAMS, max_bytes: int = D1_MAX_SQL_BYTES):
+        self.max_params = max_params
+        self.max_bytes = max_bytes
+        self.groups: dict[tuple[str, tuple], list[tuple]] = {}
+        self.updates: list[tuple[str, list]] = []
+
+    def insert(self, table: str, **row) -> None:
+        self.groups.setdefault((table, tuple(row)), []).append(tuple(row.values()))
+
+    def update(self, table: str, where: dict, **values) -> None:
+        sets = ','.join(f'{k}=?' for k in values)
+        cond = ' AND '.join(f'{k}=?' for k in where)
+        self.updates.append((f'UPDATE {table} SET {sets} WHERE {cond}',
+                             [*values.values(), *where.values()]))
+
+    def merge(self, other: 'SeedWriter', seen: set) -> int:
+        """other 의 행을 이어 붙인다 — (테이블, id)·같은 UPDATE 가 seen 에 있으면 건너뜀. 건너뛴 수."""
+        dropped = 0
+        for (table, cols), rows in other.groups.items():
+            i = cols.index('id') if 'id' in cols else None
+            dst = self.groups.setdefault((table, cols), [])
+            for row in rows:
+                if i is not None:
+                    key = (table, row[i])
+                    if key in seen:
+                        dropped += 1
+                        continue
+                    seen.add(key)
+                dst.append(row)
+        for sql, params in other.updates:
+            key = (sql, *params)
+            if key in seen:
+                dropped += 1
+                continue
+            seen.add(key)
+            self.updates.append((sql, params))
+        return dropped
+
+    @property
+    def n_rows(self) -> int:
+        return sum(len(rows) for rows in self.groups.values())
+
+    def _ordered(self):
+        rank = {t: i for i, t in enumerate(TABLE_ORDER)}
+        return sorted(self.groups.items(), key=lambda kv: rank.get(kv[0][0], len(rank)))
+
+    def batches(self):
+        """(테이블, 파라미터 SQL, params, 리터럴 SQL) 를 배치마다.
+
+        배치당 행 수는 max_params // 컬럼 수, 리터럴 SQL 이 max_bytes 를 넘기 전에도 자른다.
+        """
+        for (table, cols), rows in self._ordered():
+            head = f"INSERT OR IGNORE INTO {table}({','.join(cols)}) VALUES"
+            ph = '(' + ','.join('?' * len(cols)) + ')'
+            per = max(1, self.max_params // len(cols))
+            batch, lits, size = [], [], len(head) + 1
+            for row in rows:
+                lit = '(' + ','.join(sql_lit(v) for v in row) + ')'
+                if batch and (len(batch) == per or size + len(lit.encode()) + 1 > self.max_bytes):
+                    yield table, head + ','.join([ph] * len(batch)), \
+                        [v for r in batch for v in r], head + ','.join(lits) + ';'
+                    batch, lits, size = [], [], len(head) + 1
+                batch.append(row)
+                lits.append(lit)
+                size += len(lit.encode()) + 1
+            if batch:
+                yield table, head + ','.join([ph] * len(batch)), \
+                    [v for r in batch for v in r], head + ','.join(lits) + ';'
+        for sql, params in self.updates:
+            head, *rest = sql.split('?')
+            lit = head + ''.join(sql_lit(v) + tail for v, tail in zip(params, rest))
+            yield sql.split()[1], sql, params, lit + ';'
+
+    def statements(self) -> list[str]:
+        """wrangler d1 execute --file 용 SQL 문 목록 (테이블마다 주석 1줄)."""
+        out, last = [], None
+        for table, _, _, lit in self.batches():
+            if table != last:
+                out.append(f'-- {table}')
+                last = table
+            out.append(lit)
+        return out
+
+    def ndjson(self) -> str:
+        """배치마다 {"table", "sql", "params"} 한 줄 — 엔드포인트가 prepare().bind() 로 db.batch()."""
+        return ''.join(json.dumps({'table': t, 'sql': sql, 'params': params},
+                                  ensure_ascii=False, separators=(',', ':')) + '\n'
+                       for t, sql, params, _ in self.batches())
+
+
+# ── manifest ─────────────────────────────────────────────
+def load_manifest(path: Path) -> dict:
+    """교재 manifest 읽기 — 상대경로를 manifest 기준 절대경로로, 기본값 채우기."""
+    path = Path(path)
+    book = json.loads(path.read_text(encoding='utf-8'))
+    base = path.resolve().parent
+    book['derivatives'] = str(base / book['derivatives']) if 'derivatives' in book \
+        else str(DERIVATIVES_JSON)
+    book['dedup'] = str(base / book['dedup']) if 'dedup' in book else str(DEDUP_JSON)
+    for ch in book['chapters']:
+        ch.setdefault('id', f'{book["id"]}-ch{ch["no"]:02d}')
+        ch.setdefault('item_prefix', f'ei-{ch["id"]}')
+        ch['pages'] = str(base / ch['pages'])
+        ch['exam'] = str(base / ch['exam'])
+    # 그림 파일명 → figure id (교재 전체) — 다른 챕터의 대표 크롭도 같은 R2 객체로
+    book['figure_ids'] = {f['file']: f['id'] for ch in book['chapters']
+                          for f in ch.get('figures', [])}
+    return book
+
+
+def _page(pages: dict, scan_page: int | None) -> dict | None:
+    if scan_page is None:
+        return None
+    return next((p for p in pages['pages'] if p['scan_page'] == scan_page), None)
+
+
+def chapter_seed(book: dict, ch: dict, pages: dict, exam: dict,
+                 w: SeedWriter | None = None) -> SeedWriter:
+    """챕터 1개 (페이지·시험 JSON + manifest 항목) → 시드 행을 담은 SeedWriter."""
+    w = w or SeedWriter()
+    chapter_id = ch['id']
+    scan = ch.get('scan_pages', {})
+
+    # ── 1. 교재 + 챕터 ─────────────────────────────────────────
+    w.insert('med_books', id=book['id'], title=book['title'], publisher=book.get('publisher'),
+             field=book.get('field'))
+    w.insert('med_chapters', id=chapter_id, book_id=book['id'], chapter_no=ch['no'],
+             title=ch['title'], page_start=ch.get('page_start'), page_end=ch.get('page_end'),
+             objectives=ch.get('objectives'))
+
+    # ── 2. 단어 요소 (scan_pages.parts 의 reference_table) ────
+    part_id_map = {}  # (role, value) → id
+
+    def add_part(role, value, meaning, **extra):
+        pid = slugify_part(role, value)
+        part_id_map[(role, value)] = pid
+        w.insert('med_word_parts', id=pid, chapter_id=chapter_id, role=role, value=value,
+                 meaning_ko=meaning, **extra)
+
+    parts_table = _page(pages, scan.get('parts')) or {}
+    for p in parts_table.get('prefixes', []):
+        add_part('p', p['prefix'], p['meaning'])
+
+    for r in parts_table.get('roots_combining_forms', []):
+        # 'append/o, appendic/o' 같이 다중 표기는 첫 표기만
+        # 'cardi/o' 형태면 그대로, 단일 어근(예: 'lith')도 허용
+        add_part('r', r['form'].split(',')[0].strip(), r['meaning'])
+
+    for s in parts_table.get('suffixes', []):
+        add_part('s', s['suffix'], s['meaning'])
+
+    # 어원 어근 표 (scan_pages.etymology — Ch.01 은 표 1-1)
+    table_page = _page(pages, scan.get('etymology'))
+    if table_page and 'table_1_1' in table_page:
+        for row in table_page['table_1_1']['rows']:
+            value = row['root']
+            if ('r', value) in part_id_map:
+                continue
+            origin = row['origin']
+            add_part('r', value, row['meaning'],
+                     origin=origin.split(',')[-1].strip() if ',' in origin else None,
+                     origin_word=origin.split(',')[0].strip() if ',' in origin else origin)
+
+    # ── 3. 의학용어 + 합성 (시험 JSON 의 parts 배열 기반) ─────────────
+    seen_terms = set()
+    for q in exam['questions']:
+        if q.get('type') != '용어분해' or 'parts' not in q:
+            continue
+        # question 에서 용어 추출 — 'cardiology' 같은 단일 단어
+        m = re.search(r'분리하시오:\s*([a-zA-Z-]+)', q['question'])
+        if not m:
+            continue
+        term = m.group(1)
+        if term in seen_terms:
+            continue
+        seen_terms.add(term)
+        term_id = slugify_term(term)
+        # 의미 추론 — exam answer/explanation 에서 한국어 의미 시도
+        meaning_ko = None
+        if 'explanation' in q:
+            m2 = re.search(r"→\s*'?([^'.]+)", q['explanation'])
+            if m2:
+                meaning_ko = m2.group(1).strip()
+        w.insert('med_terms', id=term_id, chapter_id=chapter_id, term=term,
+                 meaning_ko=meaning_ko or '— (미입력)', is_constructed=1)
+        # 합성 링크
+        for pos, part in enumerate(q['parts']):
+            role = part['role']
+            value = part['value']
+            # cv 의 'o' 같은 결합모음은 part_id_map 에 없을 수 있음 → 동적 생성
+            if (role, value) not in part_id_map:
+                add_part(role, value, part.get('meaning') or part.get('label_ko') or '')
+            w.insert('med_term_parts', id=f'tp-{term_id[3:]}-{pos}', term_id=term_id,
+                     part_id=part_id_map[(role, value)], position=pos)
+
+    # ── 4. 복수형 규칙이 적용된 용어 (scan_pages.plurals) ──────────────
+    plurals_page = _page(pages, scan.get('plurals'))
+    if plurals_page:
+        for t in plurals_page.get('terms', []):
+            # 단수형은 rule 에서 추출 — 단순화: rule 첫 단어
+            rule_text = t.get('rule', '')
+            m = re.match(r'단수\s+(\S+)\s*→\s*복수\s+(\S+)', rule_text)
+            if not m:
+                continue
+            singular, plural = m.group(1), m.group(2)
+            term_id = slugify_term(singular)
+            if singular in seen_terms:
+                # 이미 있으면 plural_form/plural_rule UPDATE
+                w.update('med_terms', {'id': term_id}, plural_form=plural, plural_rule=rule_text)
+            else:
+                seen_terms.add(singular)
+                w.insert('med_terms', id=term_id, chapter_id=chapter_id, term=singular,
+                         meaning_ko=t.get('ko', singular), plural_form=plural,
+                         plural_rule=rule_text)
+
+    # ── 5. 출제 문항 (시험 JSON 전체) ─────────────────────────────
+    for q in exam['questions']:
+        body = {k: v for k, v in q.items() if k in
+                ('choices', 'items', 'options', 'parts', 'questions', 'available_parts',
+                 'definitions', 'answer_form', 'rule', 'plural_rules')}
+        w.insert('med_exam_items', id=f'{ch["item_prefix"]}-{q["no"]:03d}',
+                 chapter_id=chapter_id, no=int(q['no']), type=q['type'], topic=q.get('topic'),
+                 difficulty=q['difficulty'], question=q['question'],
+                 body_json=json.dumps(body, ensure_ascii=False),
+                 answer_json=json.dumps(q.get('answer'), ensure_ascii=False),
+                 explanation=q.get('explanation'))
+
+    # ── 6. 그림 메타데이터 (R2 업로드는 별도 작업 — 본 시드는 메타만) ──
+    # width/height 는 figure_derivatives.py manifest 에서 (없으면 NULL)
+    derivs_path, dedup_path = Path(book['derivatives']), Path(book['dedup'])
+    derivs = (json.loads(derivs_path.read_text(encoding='utf-8'))
+              if derivs_path.exists() else {})
+    # 중복 그림은 dedup_figures.py 대표 파일의 R2 객체를 공유 (없으면 그림마다 개별)
+    dedup_map = (json.loads(dedup_path.read_text(encoding='utf-8'))['map']
+                 if dedup_path.exists() else {})
+    figures = ch.get('figures', [])
+    # 대표 파일 → 객체 id 는 교재(여러 교재면 전체) 기준 — 클러스터의 모든 그림이 같은 r2_key
+    fid_by_fname = book.get('figure_ids') or {f['file']: f['id'] for f in figures}
+    for fig in figures:
+        canon = dedup_map.get(fig['file'], fig['file'])
+        object_id = fid_by_fname.get(canon, Path(canon).stem)
+        size = derivs.get(canon, {})
+        # R2 키는 academy 별로 다름 — 시드 시에는 placeholder, 업로드 시 갱신
+        w.insert('med_figures', id=fig['id'], chapter_id=chapter_id, label=fig['label'],
+                 caption=fig.get('caption'), fig_type=fig.get('type'),
+                 r2_key=f'medterm/_pending/{object_id}.jpg',
+                 width=size.get('width'), height=size.get('height'))
+
+    # 그림 위 결합형 라벨 (anchors 좌표는 이미지에서 읽은 비율)
+    for spec in ch.get('labels', []):
+        prefix = spec.get('prefix', 'fl-' + spec['figure'].removeprefix('fig-'))
+        for i, (key, text, x, y) in enumerate(spec['anchors']):
+            value = key.lower()
+            # 참조 표에 없는 결합형은 그림에서만 등장 → 동적 생성
+            if ('r', value) not in part_id_map:
+                # text 에서 의미 추출: 'Cardi/o = heart 심장' → '심장'
+                m = re.search(r'=\s*\w+\s+(\S+)', text)
+                add_part('r', value, m.group(1) if m else '')
+            w.insert('med_figure_labels', id=f'{prefix}-{i+1:02d}', figure_id=spec['figure'],
+                     part_id=part_id_map[('r', value)], x_ratio=x, y_ratio=y, text=text)
+    return w
+
+
+def chapter_job(book: dict, ch: dict) -> tuple[SeedWriter, float]:
+    """워커용 — 챕터 JSON 을 읽어 chapter_seed. (행, 소요 초)."""
+    t0 = time.perf_counter()
+    pages = json.loads(Path(ch['pages']).read_text(encoding='utf-8'))
+    exam = json.loads(Path(ch['exam']).read_text(encoding='utf-8'))
+    return chapter_seed(book, ch, pages, exam), time.perf_counter() - t0
+
+
+def seed_books(books: list[dict], *, workers: int = 1, chapters: set[int] | None = None,
+               max_params: int = D1_MAX_PARAMS,
+               max_bytes: int = D1_MAX_SQL_BYTES) -> tuple[SeedWriter, dict]:
+    """여러 교재 → 병합된 SeedWriter + 통계 {chapters, rows, shared, seconds}.
+
+    chapters 가 있으면 그 번호의 챕터만.
+    """
+    figure_ids: dict[str, str] = {}
+    for book in books:
+        for fname, fid in book.get('figure_ids', {}).items():
+            figure_ids.setdefault(fname, fid)
+    books = [{**book, 'figure_ids': figure_ids} for book in books]
+    jobs = [(book, ch) for book in books for ch in book['chapters']
+            if chapters is None or ch['no'] in chapters]
+    with stage('seed.chapters'):
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+                results = list(ex.map(chapter_job, *zip(*jobs)))
+        else:
+            results = [chapter_job(book, ch) for book, ch in jobs]
+    with stage('seed.merge'):
+        out = SeedWriter(max_params=max_params, max_bytes=max_bytes)
+        seen: set = set()
+        shared = sum(out.merge(w, seen) for w, _ in results)
+    return out, {'chapters': len(jobs), 'rows': out.n_rows, 'shared': shared,
+                 'seconds': round(sum(s for _, s in results), 3)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('manifests', nargs='+', type=Path, help='교재 manifest JSON')
+    ap.add_argument('--out', type=Path, required=True, help='SQL 출력 경로')
+    ap.add_argument('--ndjson', type=Path, default=None,
+                    help='파라미터 바인딩 배치를 NDJSON 으로도 저장 (bulk import 용)')
+    ap.add_argument('--chapters', type=int, nargs='+', default=None, help='챕터 번호만')
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                    help='챕터 처리 프로세스 수 (기본: CPU 수)')
+    ap.add_argument('--max-params', type=int, default=D1_MAX_PARAMS,
+                    help='배치당 바인딩 파라미터 상한')
+    ap.add_argument('--max-bytes', type=int, default=D1_MAX_SQL_BYTES,
+                    help='SQL 문 1개 길이 상한 (bytes)')
+    profiling.add_cli_flag(ap)
+    args = ap.parse_args()
+    profiling.init_from_args(args)
+
+    t0 = time.perf_counter()
+    books = [load_manifest(p) for p in args.manifests]
+    w, stats = seed_books(books, workers=args.workers,
+                          chapters=set(args.chapters) if args.chapters else None,
+                          max_params=args.max_params, max_bytes=args.max_bytes)
+    with stage('seed.write'):
+        stmts = [f'-- ===== {" · ".join(b["title"] for b in books)} 시드 (자동 생성) =====',
+                 f'-- 적용: wrangler d1 execute wawa-smart-erp --remote --file={args.out}',
+                 ''] + w.statements()
+        sql = '\n'.join(stmts) + '\n'
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(sql, encoding='utf-8')
+        if args.ndjson:
+            args.ndjson.parent.mkdir(parents=True, exist_ok=True)
+            args.ndjson.write_text(w.ndjson(), encoding='utf-8')
+    print(f'교재 {len(books)}권 · 챕터 {stats["chapters"]}개 — 행 {stats["rows"]}개 '
+          f'(챕터 간 중복 행 {stats["shared"]}개 제거)')
+    print(f'INSERT 문: {sql.count("INSERT")} / UPDATE 문: {sql.count("UPDATE")}')
+    print(f'  {time.perf_counter() - t0:.2f}s (챕터 처리 합계 {stats["seconds"]:.2f}s, '
+          f'workers={args.workers})')
+    print(f'생성됨: {args.out}')
+    if args.ndjson:
+        print(f'NDJSON: {args.ndjson}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""auto_detect_figures 임계값 sweep — crop_figures.FIGS 정답 박스 대비 정밀도/재현율/IoU.
+
+페이지마다 디코딩·채도 채널 계산은 1회만 하고, 그 위에서
+  sat_threshold × dilate_iter × min_area_ratio
+격자를 평가한다. dilation 은 반복 횟수 오름차순으로 누적 적용
+(dilate(n) = dilate(n-m) ∘ dilate(m)) 하고, min_area_ratio 는 contour 를
+다시 찾지 않고 가장 작은 값의 박스 목록을 걸러서 얻는다.
+
+정답이 있는 페이지(FIGS)만 평가한다. 그림이 없다고 확인된 페이지는
+--negative-pages 로 넘기면 그 페이지의 검출은 모두 false positive 로 센다.
+
+사용:
+  python sweep_detect.py raw/ --thresholds 15 20 25 35 --dilate 4 6 8 12
+  python sweep_detect.py raw/ --proxy 1000 --csv sweep.csv
+"""
+import argparse
+import csv
+import itertools
+from pathlib import Path
+
+import cv2
+
+from auto_detect_figures import (
+    FigureBox, boxes_from_mask, dilate_kernel, match_boxes, saturation_channel,
+)
+from crop_figures import FIGS
+
+
+def label_boxes(page_shape: tuple[int, int], page_no: int) -> list[FigureBox]:
+    """FIGS 의 비율 좌표 → 해당 페이지의 원본 좌표 FigureBox."""
+    h, w = page_shape
+    boxes = []
+    for n, _fig_id, _caption, (x1r, y1r, x2r, y2r) in FIGS:
+        if n != page_no:
+            continue
+        x1, y1, x2, y2 = int(w*x1r), int(h*y1r), int(w*x2r), int(h*y2r)
+        boxes.append(FigureBox(n, x1, y1, x2 - x1, y2 - y1, (x2 - x1) * (y2 - y1) / (w * h)))
+    return boxes
+
+
+def sweep_page(img, page_no: int, thresholds: list[int], dilate_iters: list[int],
+               min_area_ratios: list[float], *, max_area_ratio: float = 0.65,
+               proxy_long_side: int | None = None) -> dict[tuple, list[FigureBox]]:
+    """한 페이지에 대해 격자 전체의 검출 박스 반환 — key = (threshold, dilate_iter, min_area_ratio)."""
+    sat, scale = saturation_channel(img, proxy_long_side)
+    kernel = dilate_kernel(scale)
+    lowest = min(min_area_ratios)
+    out: dict[tuple, list[FigureBox]] = {}
+    for thr in thresholds:
+        _, mask = cv2.threshold(sat, thr, 255, cv2.THRESH_BINARY)
+        done = 0
+        for it in sorted(dilate_iters):
+            if it > done:
+                mask = cv2.dilate(mask, kernel, iterations=it - done)
+                done = it
+            # 면적 내림차순·상위 3개 이므로 작은 min_area_ratio 결과를 거르면 동일
+            base = boxes_from_mask(mask, img.shape[:2], scale, page_no,
+                                   min_area_ratio=lowest, max_area_ratio=max_area_ratio)
+            for mr in min_area_ratios:
+                out[(thr, it, mr)] = [b for b in base if b.area_ratio >= mr]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('raw_dir')
+    ap.add_argument('--thresholds', type=int, nargs='+', default=[15, 20, 25, 30, 40])
+    ap.add_argument('--dilate', type=int, nargs='+', default=[4, 6, 8, 10, 12])
+    ap.add_argument('--min-area', type=float, nargs='+', default=[0.02, 0.04, 0.06])
+    ap.add_argument('--max-area', type=float, default=0.65)
+    ap.add_argument('--proxy', type=int, default=None, metavar='PX')
+    ap.add_argument('--iou', type=float, default=0.5, help='정답 인정 IoU 하한')
+    ap.add_argument('--negative-pages', type=int, nargs='*', default=[])
+    ap.add_argument('--top', type=int, default=15)
+    ap.add_argument('--csv', type=Path, default=None)
+    args = ap.parse_args()
+
+    raw_dir = Path(args.raw_dir)
+    pages = sorted({n for n, *_ in FIGS} | set(args.negative_pages))
+    combos = list(itertools.product(args.thresholds, sorted(args.dilate), args.min_area))
+    stats = {c: {'tp': 0, 'fp': 0, 'fn': 0, 'iou': 0.0} for c in combos}
+
+    evaluated = 0
+    for n in pages:
+        src = raw_dir / f'page_{n:03d}.jpg'
+        img = cv2.imread(str(src)) if src.exists() else None
+        if img is None:
+            print(f'  [skip] page {n}: {src.name} 없음')
+            continue
+        evaluated += 1
+        labels = label_boxes(img.shape[:2], n)
+        found = sweep_page(img, n, args.thresholds, args.dilate, args.min_area,
+                           max_area_ratio=args.max_area, proxy_long_side=args.proxy)
+        for c, boxes in found.items():
+            ious, missed, extra = match_boxes(labels, boxes, min_iou=args.iou)
+            s = stats[c]
+            s['tp'] += len(ious)
+            s['fn'] += missed
+            s['fp'] += extra
+            s['iou'] += sum(ious)
+    if not evaluated:
+        ap.error(f'{raw_dir} 에 평가할 페이지 없음')
+
+    rows = []
+    for (thr, it, mr), s in stats.items():
+        precision = s['tp'] / (s['tp'] + s['fp']) if s['tp'] + s['fp'] else 0.0
+        recall = s['tp'] / (s['tp'] + s['fn']) if s['tp'] + s['fn'] else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        mean_iou = s['iou'] / s['tp'] if s['tp'] else 0.0
+        rows.append({'sat_threshold': thr, 'dilate_iter': it, 'min_area_ratio': mr,
+                     'tp': s['tp'], 'fp': s['fp'], 'fn': s['fn'],
+                     'precision': round(precision, 3), 'recall': round(recall, 3),
+                     'f1': round(f1, 3), 'mean_iou': round(mean_iou, 3)})
+    rows.sort(key=lambda r: (-r['f1'], -r['mean_iou']))
+
+    print(f'{evaluated} pages × {len(combos)} 조합 (IoU ≥ {args.iou})')
+    print(f'{"thr":>4} {"dil":>4} {"min%":>5} {"tp":>3} {"fp":>3} {"fn":>3} '
+          f'{"prec":>6} {"rec":>6} {"f1":>6} {"IoU":>6}')
+    for r in rows[:args.top]:
+        print(f'{r["sat_threshold"]:>4} {r["dilate_iter"]:>4} {r["min_area_ratio"]*100:>5.1f} '
+              f'{r["tp"]:>3} {r["fp"]:>3} {r["fn"]:>3} {r["precision"]:>6.3f} '
+              f'{r["recall"]:>6.3f} {r["f1"]:>6.3f} {r["mean_iou"]:>6.3f}')
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f'저장: {args.csv}')
+
+
+if __name__ == '__main__':
+    main()
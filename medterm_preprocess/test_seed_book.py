@@ -0,0 +1,191 @@
+"""seed_book.SeedWriter 배치 출력 테스트.
+
+output/ 데이터 없이 돌도록 작은 페이지·시험 JSON 을 테스트 안에서 만든다.
+
+검증 범위:
+  - 배치마다 바인딩 파라미터 ≤ max_params, 리터럴 SQL ≤ max_bytes
+  - 부모 테이블(FK 대상)이 자식보다 먼저 나옴
+  - 리터럴 SQL 과 NDJSON(파라미터 바인딩) 이 같은 테이블 내용으로 적재됨 (FK ON)
+  - 여러 챕터에 걸친 중복 그림 클러스터가 같은 r2_key 를 가짐 (seed_books)
+"""
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from seed_book import TABLE_ORDER, SeedWriter, chapter_seed, load_manifest, seed_books
+
+ROOT = Path(__file__).resolve().parent
+WORKERS = ROOT.parent / 'workers'
+
+
+def empty_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(':memory:')
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript('CREATE TABLE gacha_students(id TEXT PRIMARY KEY, academy_id TEXT, name TEXT);')
+    conn.executescript((WORKERS / 'migrations' / '059_medterm_system.sql').read_text(encoding='utf-8'))
+    return conn
+
+
+def dump(conn: sqlite3.Connection) -> dict:
+    """시드 테이블 전체 (created_at 제외)."""
+    out = {}
+    for t in TABLE_ORDER:
+        cols = [r[1] for r in conn.execute(f'PRAGMA table_info({t})') if r[1] != 'created_at']
+        out[t] = conn.execute(f'SELECT {",".join(cols)} FROM {t} ORDER BY 1').fetchall()
+    return out
+
+
+def sample_pages(n_roots: int = 40) -> dict:
+    return {'pages': [
+        {'scan_page': 16, 'terms': [{'en': 'vertebrae', 'ko': '척추뼈',
+                                     'rule': '단수 vertebra → 복수 vertebrae'},
+                                    {'en': 'cardiologies', 'rule': '단수 cardiology → 복수 cardiologies'}]},
+        {'scan_page': 17,
+         'prefixes': [{'prefix': f'pre{i}-', 'meaning': f"접두'{i}"} for i in range(10)],
+         'roots_combining_forms': [{'form': f'root{i}/o', 'meaning': f'어근{i}'}
+                                   for i in range(n_roots)] + [{'form': 'cardi/o', 'meaning': '심장'}],
+         'suffixes': [{'suffix': '-logy', 'meaning': '학문'}, {'suffix': '-itis', 'meaning': '염증'}]},
+        {'scan_page': 20, 'table_1_1': {'rows': [
+            {'root': 'oste', 'meaning': '뼈', 'origin': 'Greek, osteon'},
+            {'root': 'cardi/o', 'meaning': '심장', 'origin': 'Greek'}]}},
+    ]}
+
+
+def sample_exam(n: int = 60) -> dict:
+    qs = [{'no': 1, 'type': '용어분해', 'topic': '분해', 'difficulty': '중',
+           'question': '다음 용어를 분리하시오: cardiology', 'answer': 'cardi / o / logy',
+           'explanation': "cardi + o + logy → '심장학'",
+           'parts': [{'role': 'r', 'value': 'cardi/o'}, {'role': 'cv', 'value': 'o'},
+                     {'role': 's', 'value': '-logy'}]},
+          {'no': 2, 'type': '용어분해', 'topic': '분해', 'difficulty': '상',
+           'question': '다음 용어를 분리하시오: osteitis', 'answer': 'oste / itis',
+           'parts': [{'role': 'r', 'value': 'oste'}, {'role': 's', 'value': '-itis'}]}]
+    qs += [{'no': i, 'type': 'OX', 'topic': 't', 'difficulty': '하',
+            'question': f"문항 {i} — it's {'x' * (i * 7)}", 'answer': 'O'} for i in range(3, n + 1)]
+    return {'questions': qs}
+
+
+BOOK = {'id': 'bk', 'title': '테스트 교재', 'field': '간호',
+        'derivatives': '/nonexistent/d.json', 'dedup': '/nonexistent/m.json'}
+
+
+def sample_chapter(no: int = 1) -> dict:
+    return {'no': no, 'id': f'bk-ch{no:02d}', 'title': f'{no}장', 'item_prefix': f'ei-bk{no:02d}',
+            'scan_pages': {'parts': 17, 'etymology': 20, 'plurals': 16},
+            'figures': [{'id': f'fig-bk{no:02d}-1', 'label': '그림', 'type': 'anatomy',
+                         'file': f'p{no}_fig.jpg'}],
+            'labels': [{'figure': f'fig-bk{no:02d}-1',
+                        'anchors': [['Cardi/o', 'Cardi/o = heart 심장', 0.1, 0.2],
+                                    ['Ocul/o', 'Ocul/o = eye 눈', 0.3, 0.4]]}]}
+
+
+def sample_seed(**limits) -> SeedWriter:
+    return chapter_seed(BOOK, sample_chapter(), sample_pages(), sample_exam(), SeedWriter(**limits))
+
+
+class TestBatchLimits(unittest.TestCase):
+
+    def test_params_and_bytes(self):
+        for max_params, max_bytes in [(100, 100_000), (100, 1500), (30, 100_000), (12, 900)]:
+            w = sample_seed(max_params=max_params, max_bytes=max_bytes)
+            batches = list(w.batches())
+            self.assertGreater(len(batches), 1)
+            for table, sql, params, lit in batches:
+                self.assertLessEqual(len(params), max_params, f'{table} {max_params}')
+                self.assertEqual(sql.count('?'), len(params))
+                if '),(' in sql:  # 여러 행 배치만 (1행짜리는 더 쪼갤 수 없음)
+                    self.assertLessEqual(len(lit.encode()), max_bytes, f'{table} {max_bytes}')
+
+    def test_all_rows_emitted(self):
+        w = sample_seed(max_params=12, max_bytes=900)
+        n = 0
+        for _, sql, params, _ in w.batches():
+            if sql.startswith('INSERT'):
+                n += len(params) // len(sql[sql.index('(') + 1:sql.index(')')].split(','))
+        self.assertEqual(n, w.n_rows)
+
+
+class TestTableOrder(unittest.TestCase):
+
+    def test_parent_before_child(self):
+        w = SeedWriter()
+        # 자식부터 넣어도 출력은 TABLE_ORDER 순
+        w.insert('med_figure_labels', id='fl-1', figure_id='fig-1', part_id='wp-r-a', x_ratio=0.1,
+                 y_ratio=0.2, text='a')
+        w.insert('med_term_parts', id='tp-1', term_id='mt-a', part_id='wp-r-a', position=0)
+        w.update('med_terms', {'id': 'mt-a'}, plural_form='as')
+        w.insert('med_figures', id='fig-1', chapter_id='c', label='그림', fig_type='diagram', r2_key='k')
+        w.insert('med_terms', id='mt-a', chapter_id='c', term='a', meaning_ko='에이')
+        w.insert('med_word_parts', id='wp-r-a', chapter_id='c', role='r', value='a', meaning_ko='')
+        w.insert('med_chapters', id='c', book_id='b', chapter_no=1, title='1장')
+        w.insert('med_books', id='b', title='책')
+        tables = [t for t, sql, _, _ in w.batches() if sql.startswith('INSERT')]
+        self.assertEqual(tables, sorted(tables, key=TABLE_ORDER.index))
+        self.assertTrue(next(iter(reversed(list(w.batches()))))[1].startswith('UPDATE'))
+        conn = empty_db()
+        conn.executescript('\n'.join(w.statements()))  # FK ON 에서 오류 없이 적재
+        self.assertEqual(conn.execute('SELECT plural_form FROM med_terms').fetchone()[0], 'as')
+
+
+class TestLiteralVsNdjson(unittest.TestCase):
+
+    def test_same_tables(self):
+        w = sample_seed(max_params=40, max_bytes=2000)
+        literal = empty_db()
+        literal.executescript('\n'.join(w.statements()))
+        bound = empty_db()
+        for line in w.ndjson().splitlines():
+            d = json.loads(line)
+            bound.execute(d['sql'], d['params'])
+        a, b = dump(literal), dump(bound)
+        self.assertEqual(a, b)
+        self.assertEqual(len(a['med_exam_items']), 60)
+        self.assertEqual(len(a['med_figure_labels']), 2)
+        self.assertIn("접두'0", [r[4] for r in a['med_word_parts']])  # 작은따옴표 이스케이프
+
+
+class TestFigureDedupAcrossChapters(unittest.TestCase):
+
+    def test_cluster_shares_r2_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / 'pages.json').write_text(json.dumps(sample_pages()), encoding='utf-8')
+            (tmp / 'exam.json').write_text(json.dumps(sample_exam(3)), encoding='utf-8')
+            (tmp / 'dedup.json').write_text(json.dumps({'map': {
+                'page_012_fig_1-3.jpg': 'page_012_fig_1-3.jpg',
+                'page_112_fig_5-2.jpg': 'page_012_fig_1-3.jpg',   # 1장 그림의 중복 (5장)
+                'page_300_fig_9-1.jpg': 'page_900_fig_x.jpg',     # 대표가 manifest 밖
+                'page_301_fig_9-2.jpg': 'page_900_fig_x.jpg',
+            }}), encoding='utf-8')
+            chapters = [
+                {'no': 1, 'title': '1장', 'pages': 'pages.json', 'exam': 'exam.json',
+                 'figures': [{'id': 'fig-ch01-1-3', 'label': '그림 1-3', 'type': 'anatomy',
+                              'file': 'page_012_fig_1-3.jpg'},
+                             {'id': 'fig-ch01-9-1', 'label': '그림 9-1', 'type': 'diagram',
+                              'file': 'page_300_fig_9-1.jpg'}]},
+                {'no': 5, 'title': '5장', 'pages': 'pages.json', 'exam': 'exam.json',
+                 'figures': [{'id': 'fig-ch05-5-2', 'label': '그림 5-2', 'type': 'anatomy',
+                              'file': 'page_112_fig_5-2.jpg'},
+                             {'id': 'fig-ch05-9-2', 'label': '그림 9-2', 'type': 'diagram',
+                              'file': 'page_301_fig_9-2.jpg'}]},
+            ]
+            (tmp / 'book.json').write_text(json.dumps({
+                'id': 'bk', 'title': '책', 'dedup': 'dedup.json', 'chapters': chapters}),
+                encoding='utf-8')
+            # 5장만 돌려도 (1장 작업이 없어도) 교재 전체 기준으로 같은 객체
+            for only in (None, {5}):
+                w, _ = seed_books([load_manifest(tmp / 'book.json')], chapters=only)
+                conn = empty_db()
+                conn.executescript('\n'.join(w.statements()))
+                keys = dict(conn.execute('SELECT id, r2_key FROM med_figures'))
+                self.assertEqual(keys['fig-ch05-5-2'], 'medterm/_pending/fig-ch01-1-3.jpg')
+                self.assertEqual(keys['fig-ch05-9-2'], 'medterm/_pending/page_900_fig_x.jpg')
+                if only is None:
+                    self.assertEqual(keys['fig-ch01-1-3'], keys['fig-ch05-5-2'])
+                    self.assertEqual(keys['fig-ch01-9-1'], keys['fig-ch05-9-2'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,352 @@
+"""validate_exam 테스트 — 스트리밍 검증 (_Stream / iter_questions / iter_errors)
+와 교차 검증 (part_index / text_keys / cross_check).
+
+검증 범위:
+  - 아주 작은 READ_CHUNK 에서도 list(iter_errors(p)) == validate(p)
+  - 시험 JSON 을 이어 붙인 파일 = 문서별 validate 결과 (두 번째부터 [k] 접두)
+  - --max-errors N 이면 N개 찾은 뒤 파일 나머지를 읽지 않음
+  - 문법 오류는 나머지 파일을 읽지 않고 파일 기준 위치로 (validate 와 같은 메시지)
+  - 빈 파일·--max-errors 0 은 통과로 보지 않음
+  - 유형별 규칙 dispatch, workers=2 결과 = 순차 결과, --format json 보고서 모양
+  - 교차 검증: dangling 단어 요소, 이어지지 않는 분해, 파일 간 분해 불일치,
+    중복·유사 문항 (질문만 같고 보기가 다르면 중복 아님)
+"""
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import validate_exam
+from validate_exam import (VALID_TYPES, _DISPATCH, auto_workers, check_question, cross_check,
+                           iter_errors, iter_questions, part_index, text_keys, validate,
+                           validate_file, validate_files)
+
+
+def sample_exam(tag: str = '') -> dict:
+    """오류가 섞인 시험 — 경계에 걸리기 쉬운 숫자·이스케이프·중괄호 문자열 포함."""
+    return {
+        'source': {'title': f'시험 {tag} {{"가짜": [1, 2]}}', 'total': 123456789, 'ratio': -1.25e-3},
+        'questions': [
+            {'no': 1, 'type': '객관식', 'topic': '접두사', 'difficulty': '중',
+             'question': '"hyper-" 의 뜻은? \\ } ]', 'choices': ['과다', '저하', '주위', '안'],
+             'answer': 'A', 'explanation': '정답 A'},
+            {'no': 1, 'type': '서술형', 'topic': 't', 'difficulty': '최상', 'question': 'q'},
+            {'no': 3, 'type': '매칭', 'topic': 't', 'difficulty': '하', 'question': '연결',
+             'items': {'1': 'cardi/o', '2': 'oste/o'}, 'options': {'A': '심장'},
+             'answer': {'1': 'A', '2': 'B'}},
+            {'no': 4, 'type': '용어분해', 'topic': 't', 'difficulty': '상',
+             'question': '다음 용어를 분리하시오: osteitis', 'answer': 'oste / itis',
+             'parts': [{'role': 'x', 'value': 'oste'}, {'role': 's', 'value': '-itis'}]},
+            {'no': 5, 'type': 'OX', 'difficulty': '하', 'question': f'꼬리 {tag}' + 'ㅋ' * 50},
+            {'no': 1234567890123, 'type': 'OX', 'topic': 't', 'difficulty': '하',
+             'question': 'q', 'answer': 'O'},
+        ],
+        'meta': {'after_questions': [True, None, 0.5]},
+    }
+
+
+def counting_open(reads: list):
+    """open 대체 — 파일 read 호출마다 요청 크기를 reads 에 기록."""
+    real_open = open
+
+    def _open(*a, **kw):
+        f = real_open(*a, **kw)
+        read = f.read
+        f.read = lambda n=-1: reads.append(n) or read(n)
+        return f
+    return _open
+
+
+class _TmpDir(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, text: str) -> Path:
+        p = self.tmp / name
+        p.write_text(text, encoding='utf-8')
+        return p
+
+
+class TestTinyChunks(_TmpDir):
+
+    def test_same_as_validate(self):
+        data = sample_exam()
+        for indent in (None, 2):
+            p = self.write(f'exam_{indent}.json', json.dumps(data, ensure_ascii=False, indent=indent))
+            expected = validate(p)
+            self.assertTrue(expected)
+            for chunk in (1, 2, 3, 7, 64, 1 << 16):
+                with mock.patch.object(validate_exam, 'READ_CHUNK', chunk):
+                    self.assertEqual(list(iter_errors(p)), expected, f'chunk={chunk} indent={indent}')
+                    self.assertEqual([q for _, q in iter_questions(p)], data['questions'])
+
+    def test_empty_questions(self):
+        p = self.write('empty.json', '{"questions": [], "source": {}}')
+        with mock.patch.object(validate_exam, 'READ_CHUNK', 1):
+            self.assertEqual(list(iter_errors(p)), [])
+
+
+class TestConcatenated(_TmpDir):
+
+    def test_per_document(self):
+        docs = [sample_exam('a'), sample_exam('b'), {'questions': []}, sample_exam('c')]
+        parts = [self.write(f'doc{k}.json', json.dumps(d, ensure_ascii=False))
+                 for k, d in enumerate(docs)]
+        expected = []
+        for k, p in enumerate(parts):
+            expected += [f'[{k + 1}] {e}' if k else e for e in validate(p)]
+        joined = self.write('joined.json', '\n'.join(p.read_text(encoding='utf-8') for p in parts))
+        for chunk in (1, 5, 1 << 16):
+            with mock.patch.object(validate_exam, 'READ_CHUNK', chunk):
+                self.assertEqual(list(iter_errors(joined)), expected, f'chunk={chunk}')
+                self.assertEqual([d for d, _ in iter_questions(joined)],
+                                 [k for k, d in enumerate(docs) for _ in d['questions']])
+
+
+class TestMaxErrors(_TmpDir):
+
+    def test_stops_early(self):
+        # 앞부분에 오류가 충분하면 뒤쪽의 깨진 JSON 까지 읽지 않는다
+        text = json.dumps(sample_exam(), ensure_ascii=False)
+        p = self.write('broken.json', text[:-1] + ', {"no": ')
+        with mock.patch.object(validate_exam, 'READ_CHUNK', 16):
+            r = validate_file(str(p), stream=True, max_errors=3)
+            self.assertEqual(r['errors'], validate(self.write('ok.json', text))[:3])
+            self.assertFalse(r['ok'])
+            # 끝까지 읽으면 JSON 오류가 드러난다
+            r = validate_file(str(p), stream=True)
+            self.assertTrue(r['errors'][-1].startswith('파일 오류'))
+
+    def test_reads_only_prefix(self):
+        p = self.write('big.json', json.dumps(
+            {'questions': [{'no': i, 'type': '서술형'} for i in range(5000)]}, ensure_ascii=False))
+        reads = []
+        with mock.patch.object(validate_exam, 'READ_CHUNK', 256), \
+                mock.patch('builtins.open', counting_open(reads)):
+            r = validate_file(str(p), stream=True, max_errors=5)
+        self.assertEqual(len(r['errors']), 5)
+        self.assertLess(len(reads) * 256, p.stat().st_size / 10)
+
+
+class TestSyntaxErrors(_TmpDir):
+
+    def test_same_message_as_validate(self):
+        text = json.dumps(sample_exam(), ensure_ascii=False, indent=2)
+        for at in ('"difficulty": ', '"answer": ', '"meta": '):
+            i = text.index(at) + len(at)
+            p = self.write('bad.json', text[:i] + '@' + text[i:])
+            expected = validate_file(str(p))['errors']
+            self.assertIn('line', expected[0])
+            for chunk in (1, 7, 1 << 16):
+                with mock.patch.object(validate_exam, 'READ_CHUNK', chunk):
+                    self.assertEqual(validate_file(str(p), stream=True)['errors'][-1:], expected,
+                                     f'chunk={chunk} at={at}')
+
+    def test_early_error_stops_reading(self):
+        body = json.dumps({'questions': [{'no': i, 'type': 'OX'} for i in range(5000)]})
+        p = self.write('early.json', '{"questions": [{"no": 1, "type": @' + body[15:])
+        reads = []
+        with mock.patch.object(validate_exam, 'READ_CHUNK', 256), \
+                mock.patch('builtins.open', counting_open(reads)):
+            r = validate_file(str(p), stream=True)
+        self.assertEqual(r['errors'], ['파일 오류 — Expecting value: line 1 column 34 (char 33)'])
+        self.assertLessEqual(len(reads), 2)
+
+    def test_empty_file(self):
+        for text in ('', '  \n\n '):
+            p = self.write('empty.json', text)
+            r = validate_file(str(p), stream=True)
+            self.assertFalse(r['ok'])
+            self.assertEqual(r['errors'], validate_file(str(p))['errors'])
+
+    def test_max_errors_zero_rejected(self):
+        with mock.patch.object(sys, 'argv', ['validate_exam.py', '--max-errors', '0', 'x.json']), \
+                mock.patch('sys.stderr'), self.assertRaises(SystemExit) as cm:
+            validate_exam.main()
+        self.assertEqual(cm.exception.code, 2)
+
+
+class TestRules(unittest.TestCase):
+
+    def test_dispatch_covers_types(self):
+        self.assertEqual(set(_DISPATCH), VALID_TYPES)
+
+    def test_rule_messages(self):
+        seen = set()
+        errs = [e for i, q in enumerate(sample_exam()['questions'], 1)
+                for e in check_question(q, i, seen)]
+        self.assertEqual(errs, [
+            'Q#1: 중복 번호',
+            'Q#1: type 오류 — 서술형',
+            'Q#1: difficulty 오류 — 최상',
+            'Q#1: answer 누락',
+            'Q#3: 매칭 items(2) vs options(1) 길이 불일치',
+            'Q#3: 매칭 answer[2]=B 가 options 에 없음',
+            'Q#4: parts[0].role 오류 — x',
+            'Q#5: 필수 필드 누락 — topic',
+            'Q#5: answer 누락',
+        ])
+
+    def test_valid_question_per_type(self):
+        base = {'topic': 't', 'difficulty': '중', 'question': 'q'}
+        qs = [
+            {'type': '객관식', 'choices': ['a', 'b', 'c'], 'answer': 'C'},
+            {'type': '매칭', 'items': {'1': 'a'}, 'options': {'A': 'x'}, 'answer': {'1': 'A'}},
+            {'type': '용어분해', 'parts': [{'role': 'r', 'value': 'oste'}], 'answer': 'oste'},
+            {'type': '단답형', 'answer': 'a'},
+            {'type': '빈칸', 'answer': ['a', 'b']},
+            {'type': 'OX', 'answer': 'O'},
+        ]
+        self.assertEqual({q['type'] for q in qs}, VALID_TYPES)
+        seen = set()
+        for i, q in enumerate(qs, 1):
+            self.assertEqual(check_question({'no': i, **base, **q}, i, seen), [], q['type'])
+
+
+class TestFiles(_TmpDir):
+
+    def exams(self, n: int = 4) -> list[str]:
+        paths = [str(self.write(f'exam_{k}.json',
+                                json.dumps(sample_exam(str(k)), ensure_ascii=False)))
+                 for k in range(n)]
+        paths.append(str(self.write('ok.json', json.dumps({'questions': []}))))
+        paths.append(str(self.tmp / 'missing.json'))
+        return paths
+
+    def test_parallel_same_as_serial(self):
+        paths = self.exams()
+        for opts in ({}, {'stream': True}, {'stream': True, 'max_errors': 2}):
+            serial = validate_files(paths, workers=1, **opts)
+            parallel = validate_files(paths, workers=2, **opts)
+            for r in serial + parallel:
+                del r['seconds']
+            self.assertEqual(parallel, serial, opts)
+            self.assertEqual([r['file'] for r in parallel], paths)
+
+    def test_auto_workers_small_input_is_serial(self):
+        self.assertEqual(auto_workers(self.exams()), 1)
+        with mock.patch.object(validate_exam, 'PARALLEL_MIN_BYTES', 1), \
+                mock.patch('os.cpu_count', return_value=8):
+            self.assertEqual(auto_workers(self.exams(2)), 4)
+
+    def test_json_report(self):
+        paths = self.exams(2)
+        out = io.StringIO()
+        with mock.patch.object(sys, 'argv', ['validate_exam.py', *paths, '--format', 'json',
+                                             '--cross', '--pages', str(self.tmp / 'none.json')]), \
+                contextlib.redirect_stdout(out), mock.patch('sys.stderr'), \
+                self.assertRaises(SystemExit) as cm:
+            validate_exam.main()
+        self.assertEqual(cm.exception.code, 1)
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), {'ok', 'files', 'failed', 'seconds', 'results', 'cross'})
+        self.assertEqual((report['ok'], report['files'], report['failed']), (False, 4, 4))
+        self.assertEqual([r['file'] for r in report['results']], paths)
+        for r in report['results']:
+            self.assertEqual(set(r), {'file', 'ok', 'errors', 'seconds'})
+        self.assertEqual([r['ok'] for r in report['results']], [False, False, True, False])
+        self.assertTrue(report['results'][3]['errors'][0].startswith('파일 오류'))
+        self.assertEqual(set(report['cross']), {'ok', 'errors'})
+
+
+PAGES = {'pages': [
+    {'scan_page': 17,
+     'prefixes': [{'prefix': 'hyper-'}],
+     'roots_combining_forms': [{'form': 'cardi/o'}, {'form': 'oste/o, osse/o'}],
+     'suffixes': [{'suffix': '-logy'}, {'suffix': '-itis'}]},
+    {'scan_page': 20, 'table_1_1': {'rows': [{'root': 'gastr'}]}},
+]}
+
+
+def decompose(no: int, term: str, *parts: tuple[str, str]) -> dict:
+    return {'no': no, 'type': '용어분해', 'topic': 't', 'difficulty': '중',
+            'question': f'다음 용어를 분리하시오: {term}', 'answer': ' / '.join(v for _, v in parts),
+            'parts': [{'role': r, 'value': v} for r, v in parts]}
+
+
+def choice(no: int, question: str, choices: list[str], **extra) -> dict:
+    return {'no': no, 'type': '객관식', 'topic': 't', 'difficulty': '중',
+            'question': question, 'choices': choices, 'answer': 'A', **extra}
+
+
+class TestCrossIndex(unittest.TestCase):
+
+    def test_part_index(self):
+        idx = part_index(PAGES)
+        self.assertEqual(idx['p'], {'hyper'})
+        self.assertEqual(idx['r'], {'cardi', 'oste', 'osse', 'gastr'})
+        self.assertEqual(idx['cv'], {'o'})
+        self.assertEqual(idx['s'], {'logy', 'itis'})
+
+    def test_text_keys(self):
+        a = text_keys('다음 중  <b>옳은</b> 것은?')
+        self.assertEqual(a, text_keys('다음 중 옳은 것은'))
+        self.assertEqual(a[1], text_keys('옳은 것은 다음 중?')[1])
+        self.assertNotEqual(a[0], text_keys('옳은 것은 다음 중?')[0])
+
+
+class TestCrossCheck(_TmpDir):
+
+    def cross(self, *files: list[dict], pages: dict | None = PAGES) -> list[str]:
+        paths = [str(self.write(f'exam_ch{k + 1:02d}.json',
+                                json.dumps({'questions': qs}, ensure_ascii=False)))
+                 for k, qs in enumerate(files)]
+        return list(cross_check(paths, pages))
+
+    def test_clean(self):
+        self.assertEqual(self.cross(
+            [decompose(1, 'cardiology', ('r', 'cardi/o'), ('cv', 'o'), ('s', '-logy'))],
+            [decompose(1, 'osteitis', ('r', 'oste'), ('s', '-itis'))]), [])
+
+    def test_dangling_part(self):
+        errs = self.cross([decompose(1, 'neuritis', ('r', 'neur/o'), ('s', '-itis'))])
+        self.assertEqual(errs, ['exam_ch01.json Q#1: parts[0] r=neur/o — 참조 표에 없는 단어 요소'])
+        # 참조 표가 없으면 이 검사는 건너뜀
+        self.assertEqual(self.cross([decompose(1, 'neuritis', ('r', 'neur/o'), ('s', '-itis'))],
+                                    pages=None), [])
+
+    def test_parts_do_not_join(self):
+        errs = self.cross([decompose(1, 'gastritis', ('r', 'oste'), ('s', '-itis'))])
+        self.assertEqual(errs, ['exam_ch01.json Q#1: parts 를 이어도 용어 gastritis 가 되지 않음'])
+
+    def test_inconsistent_decomposition(self):
+        errs = self.cross(
+            [decompose(1, 'cardiology', ('r', 'cardi/o'), ('cv', 'o'), ('s', '-logy'))],
+            [decompose(7, 'cardiology', ('r', 'cardi'), ('s', '-ology'))])
+        self.assertIn('exam_ch02.json Q#7: 용어 cardiology 분해가 exam_ch01.json Q#1 와 다름', errs)
+
+    def test_exact_and_similar_duplicates(self):
+        errs = self.cross(
+            [choice(1, '다음 중 "심장"을 뜻하는 어근은?', ['cardi', 'oste', 'gastr', 'neur']),
+             {'no': 2, 'type': 'OX', 'topic': 't', 'difficulty': '하',
+              'question': '-itis 는 염증을 뜻한다', 'answer': 'O'}],
+            [choice(3, '다음 중, 심장을 뜻하는 어근은', ['neur', 'gastr', 'oste', 'cardi']),
+             {'no': 4, 'type': 'OX', 'topic': 't', 'difficulty': '하',
+              'question': '염증을 뜻한다 -itis 는', 'answer': 'O'}])
+        self.assertEqual(errs, [
+            'exam_ch02.json Q#3: 중복 문항 — exam_ch01.json Q#1 와 같은 질문·보기',
+            'exam_ch02.json Q#4: 유사 문항 — exam_ch01.json Q#2 와 단어 구성이 같음',
+        ])
+
+    def test_shared_stem_is_not_duplicate(self):
+        stem = '다음 중 옳은 것은?'
+        self.assertEqual(self.cross(
+            [choice(1, stem, ['cardi = 심장', 'oste = 위']),
+             choice(2, stem, ['gastr = 위', 'oste = 심장']),
+             choice(3, stem, ['cardi = 심장', 'oste = 위'], figure_id='fig-ch01-1-3')],
+            [choice(1, '옳은 것은 다음 중?', ['neur = 신경', 'oste = 심장']),
+             {'no': 2, 'type': '매칭', 'topic': 't', 'difficulty': '중', 'question': stem,
+              'items': {'1': 'cardi'}, 'options': {'A': '심장'}, 'answer': {'1': 'A'}}]), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
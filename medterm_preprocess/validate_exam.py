@@ -1,84 +1,462 @@
-"""exam_*.json 검증 — 빌드 전 스키마·일관성 확인."""
+"""exam_*.json 검증 — 빌드 전 스키마·일관성 확인.
+
+규칙은 유형별 표(TYPE_RULES)로 선언하고, 모듈 로드 시 유형 → 규칙 튜플
+dispatch 표(_DISPATCH)로 컴파일한다. 문항마다 dict 조회 1번으로 해당 유형의
+규칙만 실행한다. 여러 파일은 프로세스 풀에서 병렬 검증 (입력이 작으면 순차).
+
+--stream: 파일 전체를 json.loads 하지 않고 questions 배열을 문항 단위로
+raw_decode 하며(iter_questions) 오류를 바로 내보낸다(iter_errors). 메모리는 문항
+하나 + 읽기 버퍼 수준이고, --max-errors N 이면 N개에서 읽기를 멈춘다.
+여러 시험 JSON 을 이어 붙인 파일(객체 연속)도 그대로 읽는다.
+
+--cross: 파일별 검증 뒤 책 전체 교차 검증을 한 번 더 돈다. 참조 표
+(pages_1_to_20.json 의 단어 요소 — seed_chapter01 이 읽는 표)와 문항 텍스트로
+해시 색인을 한 번 만들고 문항마다 O(1) 조회로
+  - 용어분해 parts 가 참조 표에 없는 단어 요소 (dangling)
+  - 같은 용어를 파일마다 다르게 분해한 경우
+  - 챕터를 넘나드는 중복·유사 문항 (정규화 텍스트 / 단어 집합 일치, 보기·그림까지 같을 때)
+을 찾는다.
+
+사용:
+  python validate_exam.py output/exam_*.json
+  python validate_exam.py output/exam_*.json --format json --workers 8 > report.json
+  python validate_exam.py book_bank.json --stream --max-errors 20
+  python validate_exam.py output/exam_ch*.json --cross --pages output/pages_1_to_20.json
+"""
+import argparse
+import itertools
 import json
+import os
+import re
 import sys
+import unicodedata
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+from profiling import stage
+
 VALID_TYPES = {'객관식', '단답형', '매칭', '빈칸', '용어분해', 'OX'}
 VALID_DIFFICULTY = {'하', '중', '상'}
 VALID_ROLES = {'p', 'r', 'cv', 's'}
 REQUIRED_FIELDS = {'no', 'type', 'topic', 'difficulty', 'question'}
+PAGES_JSON = Path(__file__).parent / 'output' / 'pages_1_to_20.json'
+PARALLEL_MIN_BYTES = 8 << 20  # 이보다 작은 입력은 프로세스 풀 없이 순차 검증
+
+
+# ── 유형별 규칙 — (prefix, q) → 오류 메시지 iterable ───────────────
+def _mc_choices(prefix, q):
+    choices = q.get('choices', [])
+    if not (3 <= len(choices) <= 5):
+        yield f'{prefix}: 객관식 보기 개수 비정상 ({len(choices)})'
+    ans = q.get('answer')
+    if not (isinstance(ans, str) and ans in 'ABCDE'[:len(choices)]):
+        yield f'{prefix}: 객관식 answer는 A~{chr(ord("A")+len(choices)-1)} 중 하나 — 현재 {ans}'
+
+
+def _match_pairs(prefix, q):
+    items = q.get('items', {})
+    options = q.get('options', {})
+    ans = q.get('answer', {})
+    if len(items) != len(options):
+        yield f'{prefix}: 매칭 items({len(items)}) vs options({len(options)}) 길이 불일치'
+    if set(ans.keys()) != set(items.keys()):
+        yield f'{prefix}: 매칭 answer 키가 items 키와 불일치'
+    for k, v in ans.items():
+        if v not in options:
+            yield f'{prefix}: 매칭 answer[{k}]={v} 가 options 에 없음'
+
+
+def _decompose_parts(prefix, q):
+    if 'parts' not in q:
+        yield f'{prefix}: 용어분해는 parts 배열 필요'
+        return
+    for j, part in enumerate(q['parts']):
+        if part.get('role') not in VALID_ROLES:
+            yield f'{prefix}: parts[{j}].role 오류 — {part.get("role")}'
+        if not part.get('value'):
+            yield f'{prefix}: parts[{j}].value 비어 있음'
+
+
+TYPE_RULES = {
+    '객관식': (_mc_choices,),
+    '매칭': (_match_pairs,),
+    '용어분해': (_decompose_parts,),
+    '단답형': (),
+    '빈칸': (),
+    'OX': (),
+}
+_DISPATCH = {t: TYPE_RULES.get(t, ()) for t in VALID_TYPES}
+
+
+def check_question(q: dict, i: int, seen_no: set) -> list[str]:
+    """문항 1개 검사 — 공통 필드 → 유형 규칙 → answer 순서로 오류 메시지."""
+    errors: list[str] = []
+    prefix = f'Q#{q.get("no", f"index{i}")}'
+    for f in REQUIRED_FIELDS:
+        if f not in q:
+            errors.append(f'{prefix}: 필수 필드 누락 — {f}')
+    if q.get('no') in seen_no:
+        errors.append(f'{prefix}: 중복 번호')
+    seen_no.add(q.get('no'))
+    rules = _DISPATCH.get(q.get('type'))
+    if rules is None:
+        errors.append(f'{prefix}: type 오류 — {q.get("type")}')
+        rules = ()
+    if q.get('difficulty') not in VALID_DIFFICULTY:
+        errors.append(f'{prefix}: difficulty 오류 — {q.get("difficulty")}')
+    for rule in rules:
+        errors.extend(rule(prefix, q))
+    # 답·해설 권장
+    if 'answer' not in q:
+        errors.append(f'{prefix}: answer 누락')
+    return errors
 
 
 def validate(json_path: Path) -> list[str]:
     errors: list[str] = []
     data = json.loads(Path(json_path).read_text(encoding='utf-8'))
-
     seen_no = set()
     for i, q in enumerate(data.get('questions', []), 1):
-        prefix = f'Q#{q.get("no", f"index{i}")}'
-        for f in REQUIRED_FIELDS:
-            if f not in q:
-                errors.append(f'{prefix}: 필수 필드 누락 — {f}')
-        if q.get('no') in seen_no:
-            errors.append(f'{prefix}: 중복 번호')
-        seen_no.add(q.get('no'))
-        if q.get('type') not in VALID_TYPES:
-            errors.append(f'{prefix}: type 오류 — {q.get("type")}')
-        if q.get('difficulty') not in VALID_DIFFICULTY:
-            errors.append(f'{prefix}: difficulty 오류 — {q.get("difficulty")}')
-
-        # 객관식
-        if q.get('type') == '객관식':
-            choices = q.get('choices', [])
-            if not (3 <= len(choices) <= 5):
-                errors.append(f'{prefix}: 객관식 보기 개수 비정상 ({len(choices)})')
-            ans = q.get('answer')
-            if not (isinstance(ans, str) and ans in 'ABCDE'[:len(choices)]):
-                errors.append(f'{prefix}: 객관식 answer는 A~{chr(ord("A")+len(choices)-1)} 중 하나 — 현재 {ans}')
-
-        # 매칭
-        if q.get('type') == '매칭':
-            items = q.get('items', {})
-            options = q.get('options', {})
-            ans = q.get('answer', {})
-            if len(items) != len(options):
-                errors.append(f'{prefix}: 매칭 items({len(items)}) vs options({len(options)}) 길이 불일치')
-            if set(ans.keys()) != set(items.keys()):
-                errors.append(f'{prefix}: 매칭 answer 키가 items 키와 불일치')
-            for k, v in ans.items():
-                if v not in options:
-                    errors.append(f'{prefix}: 매칭 answer[{k}]={v} 가 options 에 없음')
-
-        # 용어분해
-        if q.get('type') == '용어분해':
-            if 'parts' not in q:
-                errors.append(f'{prefix}: 용어분해는 parts 배열 필요')
-            else:
-                for j, part in enumerate(q['parts']):
-                    if part.get('role') not in VALID_ROLES:
-                        errors.append(f'{prefix}: parts[{j}].role 오류 — {part.get("role")}')
-                    if not part.get('value'):
-                        errors.append(f'{prefix}: parts[{j}].value 비어 있음')
+        errors.extend(check_question(q, i, seen_no))
+    return errors
 
-        # 답·해설 권장
-        if 'answer' not in q:
-            errors.append(f'{prefix}: answer 누락')
 
-    return errors
+# ── 스트리밍 ─────────────────────────────────────────────
+READ_CHUNK = 1 << 16
+_WS = ' \t\r\n'
+_TAIL = 16  # 잘린 값으로 볼 버퍼 끝 범위 (true/false/null, \uXXXX 이스케이프)
+
+
+class _Stream:
+    """텍스트 파일 위의 raw_decode 커서 — 소비한 앞부분은 버퍼에서 버린다.
+
+    버린 글자·줄 수를 세어 두고, 오류 위치는 파일 기준(줄·열·char)으로 낸다.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.base = 0       # 버린 글자 수 (buf[0] 의 파일 내 위치)
+        self.base_line = 0  # 버린 줄 수
+        self.base_col = 0   # buf[0] 의 열 (0부터)
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(READ_CHUNK)
+        if not data:
+            self.eof = True
+            return False
+        dropped = self.buf[:self.pos]
+        nl = dropped.count('\n')
+        self.base += len(dropped)
+        self.base_line += nl
+        if nl:
+            self.base_col = len(dropped) - dropped.rfind('\n') - 1
+        else:
+            self.base_col += len(dropped)
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def where(self, pos: int) -> str:
+        """버퍼 위치 → json 과 같은 'line L column C (char N)' (파일 기준)."""
+        head = self.buf[:pos]
+        nl = head.count('\n')
+        col = pos - head.rfind('\n') if nl else self.base_col + pos + 1
+        return f'line {self.base_line + nl + 1} column {col} (char {self.base + pos})'
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 글자 ('' = 파일 끝)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f'JSON 구조 오류 — {ch!r} 필요, {self.peek()!r} 발견: '
+                             f'{self.where(self.pos)}')
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 1개. 버퍼 끝에 걸린 오류면 더 읽어서 다시 시도.
+
+        오류 위치가 버퍼 끝에서 _TAIL 글자보다 앞이면 잘림이 아니라 문법 오류
+        — 나머지 파일을 더 읽지 않고 바로 낸다. 닫히지 않은 문자열만 예외.
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                truncated = (len(self.buf) - e.pos <= _TAIL
+                             or e.msg.startswith('Unterminated string'))
+                if truncated and self._fill():
+                    continue
+                raise ValueError(f'{e.msg}: {self.where(e.pos)}') from e
+            if end == len(self.buf) and self._fill():  # 숫자 등이 잘렸을 수 있음
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_questions(path: Path):
+    """시험 JSON 의 (문서 번호, questions 원소) 를 하나씩 (파일 전체를 올리지 않음).
+
+    최상위 객체가 여러 개 이어진 파일이면 문서 번호(0부터)가 객체마다 올라간다.
+    """
+    with open(path, encoding='utf-8') as f:
+        s = _Stream(f)
+        doc = 0
+        while s.peek():
+            s.expect('{')
+            while s.peek() != '}':
+                key = s.value()
+                s.expect(':')
+                if key != 'questions':
+                    s.value()
+                else:
+                    s.expect('[')
+                    while s.peek() != ']':
+                        yield doc, s.value()
+                        if s.peek() == ',':
+                            s.pos += 1
+                    s.expect(']')
+                if s.peek() == ',':
+                    s.pos += 1
+            s.expect('}')
+            doc += 1
+        if not doc:  # 빈 파일·공백뿐 — validate (json.loads) 와 같은 오류
+            raise ValueError(f'Expecting value: {s.where(s.pos)}')
+
+
+def iter_errors(path: Path):
+    """스트리밍 검증 — 오류 메시지를 찾는 즉시 하나씩 (validate 와 같은 메시지·순서).
+
+    이어 붙인 파일은 문서마다 번호 중복 검사를 새로 하고, 두 번째 문서부터
+    메시지 앞에 [문서 번호] 를 붙인다.
+    """
+    seen_no = set()
+    cur = 0
+    i = 0
+    for doc, q in iter_questions(path):
+        if doc != cur:
+            cur, seen_no, i = doc, set(), 0
+        i += 1
+        for e in check_question(q, i, seen_no):
+            yield f'[{doc + 1}] {e}' if doc else e
+
+
+def validate_file(path: str, *, stream: bool = False, max_errors: int | None = None) -> dict:
+    """파일 1개 검증 결과 (워커에서도 호출) — {file, ok, errors, seconds}.
+
+    stream 이면 iter_errors 로 읽으면서 검증하고 max_errors 개에서 멈춘다.
+    """
+    t0 = time.perf_counter()
+    with stage('validate.file'):
+        try:
+            errs = iter_errors(Path(path)) if stream else validate(Path(path))
+            errs = list(itertools.islice(errs, max_errors))
+        except (OSError, ValueError) as e:  # 읽기 실패·JSON 문법 오류
+            errs = [f'파일 오류 — {e}']
+    return {'file': str(path), 'ok': not errs, 'errors': errs,
+            'seconds': round(time.perf_counter() - t0, 4)}
+
+
+def auto_workers(paths: list[str]) -> int:
+    """--workers 기본값 — 합계 PARALLEL_MIN_BYTES 미만이면 1 (풀 기동 비용이 검증보다 큼)."""
+    total = sum(os.path.getsize(p) for p in paths if os.path.isfile(p))
+    if total < PARALLEL_MIN_BYTES:
+        return 1
+    return min(os.cpu_count() or 1, len(paths))
+
+
+def validate_files(paths: list[str], workers: int = 1, **opts) -> list[dict]:
+    """여러 파일 검증 — workers > 1 이면 프로세스 풀. 결과는 paths 순서."""
+    run = partial(validate_file, **opts)
+    if workers <= 1 or len(paths) <= 1:
+        return [run(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(run, paths))
+
+
+# ── 교차 검증 (책 전체) ───────────────────────────────────
+TERM_RE = re.compile(r'분리하시오:\s*([a-zA-Z-]+)')  # seed_chapter01 과 같은 용어 추출
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _form(value: str) -> str:
+    """단어 요소 표기 정규화 — 'cardi/o' → 'cardi', '-logy' → 'logy', 'pre-' → 'pre'."""
+    return re.sub(r'[^a-z]+', '', value.split('/')[0].lower())
+
+
+def part_index(pages: dict) -> dict[str, set[str]]:
+    """참조 표 → {role: 정규화 표기 집합}. cv 는 어근 결합형의 '/' 뒤 모음에서 모은다.
+
+    seed_book.chapter_seed (1장) 와 같은 출처: scan_page 17 접두사·어근/결합형·
+    접미사 + scan_page 20 표 1-1 어근.
+    """
+    index = {'p': set(), 'r': set(), 'cv': set(), 's': set()}
+    roots = []
+    for page in pages['pages']:
+        if page['scan_page'] == 17:
+            index['p'].update(_form(p['prefix']) for p in page.get('prefixes', []))
+            index['s'].update(_form(s['suffix']) for s in page.get('suffixes', []))
+            roots += [f.strip() for r in page.get('roots_combining_forms', [])
+                      for f in r['form'].split(',')]
+        elif page['scan_page'] == 20 and 'table_1_1' in page:
+            roots += [row['root'] for row in page['table_1_1']['rows']]
+    for f in roots:
+        index['r'].add(_form(f))
+        if '/' in f:
+            index['cv'].add(_form(f.split('/', 1)[1]))
+    return index
+
+
+def text_keys(text: str) -> tuple[str, str]:
+    """문항 텍스트 → (정규화 키, 단어 집합 키).
+
+    정규화 키: NFKC·소문자, 태그·공백·문장부호 제거 — 띄어쓰기·부호만 다른 중복.
+    단어 집합 키: 정렬한 단어 집합 — 어순만 바꾼 유사 문항.
+    """
+    t = _TAG_RE.sub(' ', unicodedata.normalize('NFKC', text).lower())
+    words = re.findall(r'\w+', t)
+    return ''.join(words), ' '.join(sorted(set(words)))
+
+
+def body_key(q: dict) -> str:
+    """질문 밖 본문 → 정규화 키 — 보기(choices)·매칭 items/options·figure_id.
+
+    "다음 중 옳은 것은?" 처럼 질문이 같아도 보기·그림이 다르면 다른 문항이다.
+    보기 순서는 섞어 내기도 하므로 정렬해서 비교한다.
+    """
+    fields = []
+    for f in ('choices', 'items', 'options'):
+        v = q.get(f)
+        if isinstance(v, dict):
+            v = list(v.values())
+        if isinstance(v, list):
+            fields.append('/'.join(sorted(text_keys(str(c))[0] for c in v)))
+        else:
+            fields.append('')
+    fields.append(str(q.get('figure_id') or ''))
+    return '|'.join(fields)
+
+
+def cross_check(paths: list[str], pages: dict | None = None):
+    """여러 시험 파일의 교차 오류 메시지를 하나씩 (문항은 iter_questions 로 스트리밍).
+
+    색인은 dict/set — 참조 표는 처음에 한 번, 용어·문항 텍스트는 처음 본 위치를
+    기록하며 채운다. 중복은 처음 나온 문항을 기준으로 보고한다. 중복·유사 키는
+    질문 텍스트 + body_key (보기·매칭 항목·그림) — 질문만 같은 문항은 중복이 아니다.
+    """
+    parts = part_index(pages) if pages else None
+    terms: dict[str, tuple[tuple, str]] = {}
+    exact: dict[str, str] = {}
+    similar: dict[str, str] = {}
+    for path in paths:
+        name = Path(path).name
+        for doc, q in iter_questions(Path(path)):
+            where = f'{name}{f"[{doc + 1}]" if doc else ""} Q#{q.get("no")}'
+            if q.get('type') == '용어분해' and isinstance(q.get('parts'), list):
+                decomp = tuple((p.get('role'), _form(str(p.get('value', ''))))
+                               for p in q['parts'])
+                if parts is not None:
+                    for j, (role, form) in enumerate(decomp):
+                        if form not in parts.get(role, ()):
+                            yield (f'{where}: parts[{j}] {role}={q["parts"][j].get("value")} '
+                                   f'— 참조 표에 없는 단어 요소')
+                m = TERM_RE.search(q.get('question', ''))
+                if m:
+                    term = m.group(1).lower()
+                    if ''.join(f for _, f in decomp) != _form(term):
+                        yield f'{where}: parts 를 이어도 용어 {term} 가 되지 않음'
+                    first = terms.setdefault(term, (decomp, where))
+                    if first[0] != decomp:
+                        yield f'{where}: 용어 {term} 분해가 {first[1]} 와 다름'
+            if not isinstance(q.get('question'), str):
+                continue
+            key, bag = text_keys(q['question'])
+            body = body_key(q)
+            key, bag = f'{key}|{body}', f'{bag}|{body}'
+            first = exact.setdefault(key, where)
+            if first != where:
+                yield f'{where}: 중복 문항 — {first} 와 같은 질문·보기'
+                continue
+            first = similar.setdefault(bag, where)
+            if first != where:
+                yield f'{where}: 유사 문항 — {first} 와 단어 구성이 같음'
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f'1 이상이어야 함: {value}')
+    return n
 
 
 def main():
-    targets = sys.argv[1:] or [Path(__file__).parent / 'output' / 'exam_30q.json']
-    fail = 0
-    for path in targets:
-        errs = validate(Path(path))
-        if errs:
-            print(f'❌ {path}')
-            for e in errs:
+    ap = argparse.ArgumentParser()
+    ap.add_argument('targets', nargs='*',
+                    default=[str(Path(__file__).parent / 'output' / 'exam_30q.json')])
+    ap.add_argument('--workers', type=int, default=None,
+                    help='검증 프로세스 수 (기본: 입력 합계 8MB 이상이면 CPU 수, 아니면 1)')
+    ap.add_argument('--format', choices=('text', 'json'), default='text')
+    ap.add_argument('--stream', action='store_true', help='questions 를 문항 단위로 스트리밍 검증')
+    ap.add_argument('--max-errors', type=_positive_int, default=None, metavar='N',
+                    help='파일당 오류 N개에서 중단')
+    ap.add_argument('--cross', action='store_true',
+                    help='책 전체 교차 검증 (dangling 단어 요소·용어 분해 불일치·중복 문항)')
+    ap.add_argument('--pages', type=Path, default=PAGES_JSON,
+                    help='단어 요소 참조 표 (없으면 parts 참조 검사는 건너뜀)')
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    paths = [str(p) for p in args.targets]
+    workers = auto_workers(paths) if args.workers is None else args.workers
+    results = validate_files(paths, workers=min(workers, len(paths)),
+                             stream=args.stream, max_errors=args.max_errors)
+    fail = sum(not r['ok'] for r in results)
+    cross = None
+    if args.cross:
+        pages = (json.loads(args.pages.read_text(encoding='utf-8'))
+                 if args.pages.exists() else None)
+        if pages is None:
+            print(f'⚠️ 참조 표 없음 — parts 참조 검사 생략: {args.pages}', file=sys.stderr)
+        with stage('validate.cross'):
+            try:
+                cross = list(itertools.islice(
+                    cross_check([str(p) for p in args.targets], pages), args.max_errors))
+            except (OSError, ValueError) as e:
+                cross = [f'파일 오류 — {e}']
+        fail += bool(cross)
+    if args.format == 'json':
+        report = {'ok': not fail, 'files': len(results), 'failed': fail,
+                  'seconds': round(time.perf_counter() - t0, 4), 'results': results}
+        if cross is not None:
+            report['cross'] = {'ok': not cross, 'errors': cross}
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for r in results:
+            if r['errors']:
+                print(f'❌ {r["file"]}')
+                for e in r['errors']:
+                    print(f'  - {e}')
+            else:
+                print(f'✅ {r["file"]} — 통과 ({r["seconds"] * 1000:.1f} ms)')
+        if cross:
+            print(f'❌ 교차 검증 ({len(results)}개 파일)')
+            for e in cross:
                 print(f'  - {e}')
-            fail += 1
-        else:
-            print(f'✅ {path} — 통과')
+        elif cross is not None:
+            print(f'✅ 교차 검증 ({len(results)}개 파일) — 통과')
     sys.exit(1 if fail else 0)
 
 